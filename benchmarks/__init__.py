@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of the EVMDD Library for Python (pyevmdd).
+# Copyright (C) 2016 Robert Mattmüller
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark suite for |EVMDD| construction, apply and evaluation.
+
+Run ``python3 -m benchmarks --help`` from the repository root for usage.
+The standalone scripts `term_construction` and `compiled_evaluation` compare
+individual optimizations with their naive counterparts.
+"""
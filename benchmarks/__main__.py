@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of the EVMDD Library for Python (pyevmdd).
+# Copyright (C) 2016 Robert Mattmüller
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Run the benchmark suite.
+
+Usage: ``python3 -m benchmarks [--quick] [--family <name>]... [--output <file>]
+[--baseline <file>] [--tolerance <fraction>] [--time-tolerance <fraction>]``
+
+Results are printed as a table and, with ``--output``, written as JSON. With
+``--baseline``, the results are compared with previously written results, and
+the exit status is 1 if any metric regressed: the deterministic counts of
+nodes, edges and operator applications at all, and peak memory by more than
+the tolerance. Timings only count if ``--time-tolerance`` is given.
+"""
+
+import argparse
+import sys
+from os import path
+
+sys.path.insert(0, path.dirname(path.dirname(path.abspath(__file__))))
+
+from benchmarks import families, suite
+
+_ROW = '%-40s %10s %10s %8s %8s %10s %12s'
+
+def _print_metrics(key, metrics):
+    print(_ROW % (key, '%.4f' % metrics['construction_time'],
+                  '%d' % (metrics['peak_memory'] // 1024), metrics['nodes'],
+                  metrics['edges'], metrics['apply_calls'],
+                  '%.0f' % metrics['evaluations_per_second']))
+    sys.stdout.flush()
+
+def _parse_arguments():
+    parser = argparse.ArgumentParser(prog='python3 -m benchmarks',
+                                     description='Run the EVMDD benchmark suite.')
+    parser.add_argument('--quick', action='store_true',
+                        help='use small grids of arities and domain sizes')
+    parser.add_argument('--family', action='append', choices=sorted(families.FAMILIES),
+                        help='benchmark only the given family (repeatable)')
+    parser.add_argument('--output', help='write the results as JSON to this file')
+    parser.add_argument('--baseline', help='compare with results stored in this file')
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help='relative change of peak memory counted as '
+                             'regression (default: 0.1)')
+    parser.add_argument('--time-tolerance', type=float,
+                        help='relative change of timings counted as regression '
+                             '(default: timings are not checked)')
+    return parser.parse_args()
+
+def main():
+    args = _parse_arguments()
+    print(_ROW % ('case', 'time [s]', 'mem [KiB]', 'nodes', 'edges',
+                  'applies', 'evals/s'))
+    results = suite.run(families.iter_cases(args.family, args.quick), _print_metrics)
+    if args.output:
+        suite.save(results, args.output)
+    if args.baseline:
+        comparison = suite.compare(results, suite.load(args.baseline), args.tolerance,
+                                   args.time_tolerance)
+        print()
+        print('%-40s %-24s %12s %12s %8s' % ('case', 'metric', 'baseline',
+                                             'current', 'ratio'))
+        for key, metric, baseline_value, value, ratio, regressed in comparison:
+            print('%-40s %-24s %12.6g %12.6g %8.3f%s' % (
+                key, metric, baseline_value, value, ratio,
+                '  REGRESSION' if regressed else ''))
+        if any([regressed for _, _, _, _, _, regressed in comparison]):
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
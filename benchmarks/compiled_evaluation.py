@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of the EVMDD Library for Python (pyevmdd).
+# Copyright (C) 2016 Robert Mattmüller
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark comparing the per-call latency of `evaluate` with that of an
+|EVMDD| compiled by `EvmddManager.compile`.
+
+Usage: ``python3 benchmarks/compiled_evaluation.py [<number of variables>]``
+"""
+
+import random
+import sys
+import timeit
+from os import path
+
+sys.path.insert(0, path.dirname(path.dirname(path.abspath(__file__))))
+
+from evmdd import evaluate, term_to_evmdd
+
+_NUM_VALUATIONS = 1000
+_REPETITIONS = 5
+
+def _make_term(var_names):
+    products = ['%d*%s*%s' % (idx + 1, var, var_names[(idx + 1) % len(var_names)])
+                for idx, var in enumerate(var_names)]
+    return ' + '.join(products + var_names) + ' + 2'
+
+def _best_latency(fn, valuations):
+    timer = timeit.Timer(lambda: [fn(valuation) for valuation in valuations])
+    return min(timer.repeat(repeat=_REPETITIONS, number=1)) / len(valuations)
+
+def main():
+    num_vars = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    var_names = ['v%d' % idx for idx in range(num_vars)]
+    var_domains = {var: 3 for var in var_names}
+    evmdd, manager = term_to_evmdd(_make_term(var_names), var_names=var_names,
+                                   var_domains=var_domains)
+    compiled = manager.compile(evmdd)
+
+    rnd = random.Random(2016)
+    tuples = [tuple(rnd.randrange(3) for _ in var_names)
+              for _ in range(_NUM_VALUATIONS)]
+    dicts = [dict(zip(var_names, values)) for values in tuples]
+    assert all(compiled(values) == evaluate(evmdd, valuation, manager)
+               for values, valuation in zip(tuples, dicts))
+
+    baseline = _best_latency(lambda valuation: evaluate(evmdd, valuation, manager), dicts)
+    compiled_dict = _best_latency(compiled, dicts)
+    compiled_tuple = _best_latency(compiled, tuples)
+
+    print('variables: %d, nodes: %d, edges: %d' %
+          (num_vars, evmdd.num_nodes(), evmdd.num_edges()))
+    print('%-22s %10.2f us/call' % ('evaluate', baseline * 1e6))
+    for name, latency in [('compiled (dict)', compiled_dict),
+                          ('compiled (tuple)', compiled_tuple)]:
+        print('%-22s %10.2f us/call  (%.1fx)' % (name, latency * 1e6, baseline / latency))
+
+if __name__ == '__main__':
+    main()
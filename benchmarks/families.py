@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of the EVMDD Library for Python (pyevmdd).
+# Copyright (C) 2016 Robert Mattmüller
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Parametrized families of function terms for benchmarking.
+
+Every family is a function mapping an arity (the number of variables, or of
+variable groups) and a domain size to a `Case`. Families are registered in
+`FAMILIES` together with the grids of arities and domain sizes they are
+benchmarked at, in a quick and a full variant.
+"""
+
+import random
+from collections import namedtuple
+
+Case = namedtuple('Case', ['family', 'arity', 'domain_size', 'term',
+                           'var_names', 'var_domains'])
+
+def _case(family, arity, domain_size, term, var_names):
+    return Case(family, arity, domain_size, term, var_names,
+                {var: domain_size for var in var_names})
+
+def sums_of_products(arity, domain_size):
+    """The chain :math:`x_0 x_1 + x_1 x_2 + ... + x_{n-2} x_{n-1}` with
+    increasing coefficients."""
+    var_names = ['x%d' % idx for idx in range(arity)]
+    term = ' + '.join(['%d*%s*%s' % (idx + 1, var_names[idx], var_names[idx + 1])
+                       for idx in range(arity - 1)])
+    return _case('sums_of_products', arity, domain_size, term, var_names)
+
+def nested_powers(arity, domain_size):
+    """The term :math:`(...((x_0 + x_1)^2 + x_2)^2 ... + x_{n-1})^2`."""
+    var_names = ['x%d' % idx for idx in range(arity)]
+    term = var_names[0]
+    for var in var_names[1:]:
+        term = '(%s + %s)**2' % (term, var)
+    return _case('nested_powers', arity, domain_size, term, var_names)
+
+def random_sparse_polynomial(arity, domain_size, seed=2016):
+    """A random polynomial with `arity` monomials of degree at most 3 over
+    `arity` variables, with coefficients between -5 and 5."""
+    rnd = random.Random(seed + 1000 * arity + domain_size)
+    var_names = ['x%d' % idx for idx in range(arity)]
+    monomials = []
+    for _ in range(arity):
+        factors = rnd.sample(var_names, min(rnd.randint(1, 3), arity))
+        monomials.append('*'.join(['%d' % rnd.choice([-5, -3, -2, 2, 3, 5])] + factors))
+    return _case('random_sparse_polynomial', arity, domain_size,
+                 ' + '.join(monomials), var_names)
+
+def readme_example(arity, domain_size):
+    """The running example :math:`AB^2 + C + 2` from the documentation,
+    repeated for `arity` groups of fresh variables."""
+    var_names = []
+    summands = []
+    for idx in range(arity):
+        a, b, c = 'A%d' % idx, 'B%d' % idx, 'C%d' % idx
+        var_names += [a, b, c]
+        summands.append('%s*%s*%s + %s + 2' % (a, b, b, c))
+    return _case('readme_example', arity, domain_size, ' + '.join(summands), var_names)
+
+# Family name -> (family, quick grid, full grid); grids are lists of
+# (arity, domain size) pairs.
+FAMILIES = {
+    'sums_of_products': (sums_of_products,
+                         [(8, 2), (8, 4)],
+                         [(16, 2), (32, 2), (64, 2), (16, 4), (32, 4)]),
+    'nested_powers': (nested_powers,
+                      [(3, 2), (3, 3)],
+                      [(4, 2), (5, 2), (6, 2), (4, 3), (5, 3)]),
+    'random_sparse_polynomial': (random_sparse_polynomial,
+                                 [(8, 2), (8, 3)],
+                                 [(16, 2), (24, 2), (32, 2), (12, 3), (16, 3)]),
+    'readme_example': (readme_example,
+                       [(2, 2), (2, 3)],
+                       [(4, 2), (8, 2), (16, 2), (4, 3), (8, 3)]),
+}
+
+def iter_cases(families=None, quick=False):
+    """Iterate over the benchmark cases of the given families (default:
+    all families), using the quick or the full grids."""
+    for name in sorted(families or FAMILIES):
+        family, quick_grid, full_grid = FAMILIES[name]
+        for arity, domain_size in (quick_grid if quick else full_grid):
+            yield family(arity, domain_size)
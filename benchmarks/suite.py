@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of the EVMDD Library for Python (pyevmdd).
+# Copyright (C) 2016 Robert Mattmüller
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Measurement, JSON output and baseline comparison of benchmark cases.
+
+Each case (see `benchmarks.families`) is measured as follows:
+
+* ``construction_time``: the best wall time in seconds of `term_to_evmdd`
+  over several repetitions, repeated until they take some minimal time in
+  total.
+* ``peak_memory``: the median over several repetitions of the peak number
+  of bytes allocated during one construction, as reported by `tracemalloc`.
+* ``nodes``, ``edges``: the size of the resulting |EVMDD|.
+* ``apply_calls``: the number of operator applications during construction.
+* ``evaluations_per_second``: the best throughput of `evaluate` on random
+  valuations over several repetitions, likewise.
+
+When comparing with a baseline, the counts ``nodes``, ``edges`` and
+``apply_calls`` are deterministic, so any increase is a regression.
+``peak_memory`` is a regression beyond a relative tolerance. Timings vary
+too much between runs on shared machines to be checked by default, and are
+only counted as regressed beyond a separate relative tolerance if one is
+given.
+"""
+
+import gc
+import json
+import platform
+import random
+import time
+import tracemalloc
+
+from evmdd import evaluate, term_to_evmdd
+
+RESULTS_VERSION = 1
+
+_MIN_REPETITIONS = 5
+_MIN_TOTAL_TIME = 0.2
+_MEMORY_REPETITIONS = 3
+_NUM_VALUATIONS = 2000
+
+COUNT = 'count'
+MEMORY = 'memory'
+TIME = 'time'
+
+# For each metric, whether larger values are better, and its kind, which
+# determines the tolerance of comparisons.
+METRICS = {
+    'construction_time': (False, TIME),
+    'peak_memory': (False, MEMORY),
+    'nodes': (False, COUNT),
+    'edges': (False, COUNT),
+    'apply_calls': (False, COUNT),
+    'evaluations_per_second': (True, TIME),
+}
+
+def case_id(case):
+    return '%s/n=%d/d=%d' % (case.family, case.arity, case.domain_size)
+
+def _construct(case):
+    return term_to_evmdd(case.term, var_names=case.var_names,
+                         var_domains=case.var_domains)
+
+def _best_time(function):
+    """Call `function` repeatedly and return the best wall time in seconds
+    and the last result."""
+    best_time = float('inf')
+    total_time = 0.0
+    repetitions = 0
+    while repetitions < _MIN_REPETITIONS or total_time < _MIN_TOTAL_TIME:
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best_time = min(best_time, elapsed)
+        total_time += elapsed
+        repetitions += 1
+    return best_time, result
+
+def measure(case):
+    """Measure one benchmark case and return a dict of metrics."""
+    construction_time, (evmdd, manager) = _best_time(lambda: _construct(case))
+    apply_calls = sum(manager.stats()['apply_calls'].values())
+
+    peak_memories = []
+    for _ in range(_MEMORY_REPETITIONS):
+        gc.collect()
+        tracemalloc.start()
+        try:
+            _construct(case)
+            peak_memories.append(tracemalloc.get_traced_memory()[1])
+        finally:
+            tracemalloc.stop()
+    peak_memory = sorted(peak_memories)[len(peak_memories) // 2]
+
+    rnd = random.Random(2016)
+    valuations = [{var: rnd.randrange(case.var_domains[var]) for var in case.var_names}
+                  for _ in range(_NUM_VALUATIONS)]
+    def evaluate_all():
+        for valuation in valuations:
+            evaluate(evmdd, valuation, manager)
+    evaluation_time, _ = _best_time(evaluate_all)
+
+    return {
+        'construction_time': construction_time,
+        'peak_memory': peak_memory,
+        'nodes': evmdd.num_nodes(),
+        'edges': evmdd.num_edges(),
+        'apply_calls': apply_calls,
+        'evaluations_per_second': len(valuations) / evaluation_time,
+    }
+
+def run(cases, log=None):
+    """Measure all `cases` and return the results as a JSON-serializable dict.
+
+    If given, `log` is called with each case ID and its metrics.
+    """
+    results = {}
+    for case in cases:
+        metrics = measure(case)
+        results[case_id(case)] = metrics
+        if log:
+            log(case_id(case), metrics)
+    return {
+        'version': RESULTS_VERSION,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+
+def save(results, path):
+    with open(path, 'w') as stream:
+        json.dump(results, stream, indent=2, sort_keys=True)
+
+def load(path):
+    with open(path) as stream:
+        results = json.load(stream)
+    if results.get('version') != RESULTS_VERSION:
+        raise ValueError('Unsupported benchmark results version in %s.' % path)
+    return results
+
+def compare(results, baseline, tolerance=0.1, time_tolerance=None):
+    """Compare `results` with `baseline` case by case.
+
+    Returns:
+        a list of tuples ``(case ID, metric, baseline value, value, ratio,
+        regressed)``, where ``ratio`` is the value divided by the baseline
+        value, and ``regressed`` tells whether the value is worse than the
+        baseline value: at all for counts, by more than the relative
+        `tolerance` for memory, and by more than the relative
+        `time_tolerance` for timings. Timings are never regressed if
+        `time_tolerance` is `None`.
+    """
+    tolerances = {COUNT: 0, MEMORY: tolerance, TIME: time_tolerance}
+    comparison = []
+    for key in sorted(results['results']):
+        if key not in baseline['results']:
+            continue
+        metrics = results['results'][key]
+        baseline_metrics = baseline['results'][key]
+        for metric, (larger_is_better, kind) in sorted(METRICS.items()):
+            value = metrics.get(metric)
+            baseline_value = baseline_metrics.get(metric)
+            if value is None or not baseline_value:
+                continue
+            ratio = value / baseline_value
+            metric_tolerance = tolerances[kind]
+            if metric_tolerance is None:
+                regressed = False
+            elif larger_is_better:
+                regressed = ratio < 1 - metric_tolerance
+            else:
+                regressed = ratio > 1 + metric_tolerance
+            comparison.append((key, metric, baseline_value, value, ratio, regressed))
+    return comparison
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of the EVMDD Library for Python (pyevmdd).
+# Copyright (C) 2016 Robert Mattmüller
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark comparing `term_to_evmdd`, which shares repeated subterms and
+combines n-ary sums and products in a balanced way, with a naive left-deep
+construction that translates every summand separately.
+
+Usage: ``python3 benchmarks/term_construction.py [<number of summands>]``
+"""
+
+import sys
+import time
+from functools import reduce
+from os import path
+
+sys.path.insert(0, path.dirname(path.dirname(path.abspath(__file__))))
+
+from evmdd import EvmddManager, term_to_evmdd
+
+def _chain_summands(num_summands):
+    return ['x%d*x%d' % (idx, idx + 1) for idx in range(num_summands)]
+
+def _repeated_summands(num_summands):
+    return ['x%d*x%d' % (idx % 10, idx % 10 + 1) for idx in range(num_summands)]
+
+def _naive_construction(summands, var_names):
+    manager = EvmddManager(var_names, [2] * len(var_names))
+    def translate(summand):
+        left, right = summand.split('*')
+        return (manager.make_var_evmdd_for_var(left) *
+                manager.make_var_evmdd_for_var(right))
+    return reduce(lambda evmdd1, evmdd2: evmdd1 + evmdd2, map(translate, summands))
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+def main():
+    num_summands = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10 * num_summands))
+    print('%-10s %8s %12s %12s %8s' % ('family', 'summands', 'naive [s]',
+                                       'parser [s]', 'nodes'))
+    for name, family in [('chain', _chain_summands), ('repeated', _repeated_summands)]:
+        summands = family(num_summands)
+        var_names = ['x%d' % idx for idx in range(num_summands + 1)]
+        naive, naive_time = _timed(lambda: _naive_construction(summands, var_names))
+        (evmdd, _), parser_time = _timed(
+            lambda: term_to_evmdd(' + '.join(summands), var_names=var_names))
+        assert naive.num_nodes() == evmdd.num_nodes()
+        print('%-10s %8d %12.3f %12.3f %8d' % (name, num_summands, naive_time,
+                                              parser_time, evmdd.num_nodes()))
+
+if __name__ == '__main__':
+    main()
@@ -20,5 +20,16 @@
 from .evmdd import Edge, Node, EvmddManager, evaluate
 from .parser import collect_variables, read_function_term, term_to_evmdd
 from .graphviz import GraphvizWriter, EvmddVisualizer
+from .compact import CompactEvmdd, CompiledEvmdd
+from .batch import evaluate_batch
+from .dense import to_array, from_array
+from .builder import from_function, from_values
+from .serialize import save_evmdd, load_evmdd
+from .cache import EvmddCache
+from .parallel import build_many
+from .ordering import order_variables
+from . import reorder, restrict
+from .incremental import IncrementalEvaluator
+from .reduction import to_fully_reduced, to_quasi_reduced
 
-__all__ = ['evmdd', 'parser', 'graphviz']
+__all__ = ['evmdd', 'parser', 'builder', 'graphviz', 'compact', 'serialize', 'cache', 'parallel', 'batch', 'dense', 'ordering', 'reorder', 'restrict', 'incremental', 'reduction']
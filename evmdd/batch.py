@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of the EVMDD Library for Python (pyevmdd).
+# Copyright (C) 2016 Robert Mattmüller
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Vectorized evaluation of |EVMDDs| for many valuations at once.
+
+This module requires `NumPy <http://www.numpy.org/>`_.
+"""
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .compact import CompactEvmdd, SINK_INDEX
+
+def _require_numpy():
+    if np is None:
+        raise ImportError('Batch evaluation of EVMDDs requires NumPy.')
+
+def _as_compact(evmdd, manager):
+    if isinstance(evmdd, CompactEvmdd):
+        evmdd._check_order_version()
+        return evmdd
+    return CompactEvmdd.from_evmdd(evmdd, manager)
+
+def evaluate_batch(evmdd, valuations, manager):
+    """Evaluate an |EVMDD| `evmdd` for many valuations at once.
+
+    All valuations are advanced simultaneously, one edge per step, using
+    vectorized lookups in the flat node and edge tables of the compact form
+    of `evmdd` (see `CompactEvmdd`). The number of steps is bounded by the
+    number of variables, independently of the number of valuations.
+
+    If `evmdd` is an `Edge`, it is converted to compact form first. To
+    evaluate the same |EVMDD| repeatedly, convert it once using
+    `EvmddManager.compact` and pass the compact |EVMDD| instead.
+
+    Args:
+        `evmdd` (Edge or CompactEvmdd): an |EVMDD|.
+
+        `valuations` (2-D array of ints): one valuation per row, and one
+        column per variable, in the variable order of `manager`.
+
+        `manager` (EvmddManager): the manager of `evmdd`.
+
+    Returns:
+        `numpy.ndarray`: a 1-D array of 64-bit integers holding the value of
+        `evmdd` for each row of `valuations`.
+
+    Example:
+        >>> from .parser import term_to_evmdd
+        >>> evmdd, manager = term_to_evmdd('A*B**2 + C + 2',
+        ...     var_names=['A', 'B', 'C'], var_domains={'A': 2, 'B': 3, 'C': 2})
+        >>> evaluate_batch(evmdd, [[1, 2, 0], [0, 2, 1], [1, 1, 1]], manager)
+        array([6, 3, 4])
+    """
+    _require_numpy()
+    compact = _as_compact(evmdd, manager)
+    var_domains = np.asarray(manager._var_domains, dtype=np.int64)
+    num_vars = len(var_domains)
+
+    valuations = np.asarray(valuations, dtype=np.int64)
+    if valuations.ndim != 2 or valuations.shape[1] != num_vars:
+        raise ValueError('Expected valuations of shape (n, %d), got %s.' %
+                         (num_vars, valuations.shape))
+    if not np.all((valuations >= 0) & (valuations < var_domains)):
+        raise ValueError('Valuations contain values outside variable domains.')
+
+    child_offsets = np.frombuffer(compact.child_offsets, dtype=np.int64)
+    child_weights = np.frombuffer(compact.child_weights, dtype=np.int64)
+    child_succs = np.frombuffer(compact.child_succs, dtype=np.int64)
+    # Column of the variable tested at each node; unused for the sink node.
+    columns = num_vars - np.frombuffer(compact.levels, dtype=np.int32).astype(np.int64)
+
+    num_rows = valuations.shape[0]
+    nodes = np.full(num_rows, compact.root, dtype=np.int64)
+    results = np.full(num_rows, compact.root_weight, dtype=np.int64)
+    rows = np.arange(num_rows) if compact.root != SINK_INDEX else np.arange(0)
+    while rows.size:
+        current = nodes[rows]
+        edges = child_offsets[current] + valuations[rows, columns[current]]
+        results[rows] += child_weights[edges]
+        current = child_succs[edges]
+        nodes[rows] = current
+        rows = rows[current != SINK_INDEX]
+    return results
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of the EVMDD Library for Python (pyevmdd).
+# Copyright (C) 2016 Robert Mattmüller
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Construction of |EVMDDs| from arbitrary functions given point by point.
+
+Function terms (see `parser.term_to_evmdd`) are restricted to polynomials.
+Any other function over the variables of a manager can be given either as a
+Python callable (see `from_function`) or as the sequence of its values for
+all valuations in lexicographic order (see `from_values`), i.e., with the
+first variable of the manager changing slowest and the last variable
+changing fastest.
+
+The |EVMDD| is built bottom-up in a single pass over the values. For each
+level, the builder keeps the completed children of the node it is currently
+assembling on that level. Each value completes a child of the node on the
+lowest level. As soon as all children of a node are complete, the node is
+normalized, created through the unique table, and becomes a completed child
+of the node on the level above. Besides the |EVMDD| itself, the builder thus
+only holds at most one partial node per level, independently of the number
+of values.
+"""
+
+import itertools
+from numbers import Integral
+
+from .evmdd import Edge, _make_node_evmdd, _make_sink_node
+
+def from_values(values, manager):
+    """Build the |EVMDD| with given values for all valuations.
+
+    Args:
+        `values` (iterable of ints): the function values for all valuations
+        of the variables of `manager`, in lexicographic order with respect to
+        the variable order of `manager`. Values are consumed one at a time.
+
+        `manager` (EvmddManager): the manager of the new |EVMDD|.
+
+    Returns:
+        `Edge`: the |EVMDD| of `manager` representing the function.
+
+    Note:
+        Fails with a `ValueError` if `values` yields too few or too many
+        values, or values that are not integers.
+
+    Example:
+        >>> from .evmdd import EvmddManager
+        >>> manager = EvmddManager(['A', 'B'], [2, 3])
+        >>> a = manager.make_var_evmdd_for_var('A')
+        >>> b = manager.make_var_evmdd_for_var('B')
+        >>> from_values(iter([0, 1, 2, 1, 2, 3]), manager) is a + b
+        True
+    """
+    is_fully_reduced = manager._fully_reduced
+    num_vars = len(manager._var_names)
+    domain_sizes = [None] + [manager._level_to_domain_size(level)
+                             for level in range(1, num_vars + 1)]
+    sink = _make_sink_node(is_fully_reduced, manager._store)
+
+    # The completed children of the partial node on each level.
+    partial = [[] for _ in range(num_vars + 1)]
+    root = None
+    values = iter(values)
+    for value in values:
+        if not isinstance(value, Integral):
+            raise ValueError('Expected an integer value, got %r.' % (value,))
+        completed = Edge(int(value), sink, is_fully_reduced)
+        for level in range(1, num_vars + 1):
+            children = partial[level]
+            children.append(completed)
+            if len(children) < domain_sizes[level]:
+                completed = None
+                break
+            completed = _make_node_evmdd(level, children, is_fully_reduced)
+            partial[level] = []
+        if completed is not None:
+            root = completed
+            break
+    if root is None:
+        raise ValueError('Too few values for the variables of the manager.')
+    for _ in values:
+        raise ValueError('Too many values for the variables of the manager.')
+    return root
+
+def from_function(function, manager):
+    """Build the |EVMDD| of a function given as a Python callable.
+
+    Args:
+        `function` (callable): a function mapping a valuation, given as a
+        dict from variable names to values, to an integer.
+
+        `manager` (EvmddManager): the manager of the new |EVMDD|.
+
+    Returns:
+        `Edge`: the |EVMDD| of `manager` representing `function`. The
+        function is called once for each valuation of the variables of
+        `manager` (see `from_values`).
+
+    Example:
+        >>> from .evmdd import EvmddManager, evaluate
+        >>> manager = EvmddManager(['A', 'B', 'C'], [3, 2, 4])
+        >>> evmdd = from_function(lambda s: max(s['A'], s['C']) % 3, manager)
+        >>> evmdd.num_nodes()
+        5
+        >>> evaluate(evmdd, {'A': 1, 'B': 0, 'C': 3}, manager)
+        0
+    """
+    var_names = manager._var_names
+    valuations = itertools.product(*[range(domain_size)
+                                     for domain_size in manager._var_domains])
+    return from_values((function(dict(zip(var_names, valuation)))
+                        for valuation in valuations), manager)
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of the EVMDD Library for Python (pyevmdd).
+# Copyright (C) 2016 Robert Mattmüller
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Persistent caching of |EVMDDs| built from function terms.
+"""
+
+import ast
+import hashlib
+import os
+import struct
+import tempfile
+import time
+
+from .parser import read_function_term, term_to_evmdd, _resolve_variables
+from .serialize import FORMAT_VERSION, load_evmdd, save_evmdd
+from .util import ComputedTable
+
+_SUFFIX = '.evmdd'
+_TEMP_SUFFIX = '.tmp'
+# Marks the version subdirectories created by a cache. Only those are ever
+# removed when the format version changes.
+_MARKER = '.pyevmdd-cache'
+# Temporary files older than this many seconds are left over from processes
+# that were killed while writing a result, and are removed.
+_STALE_TEMP_AGE = 3600
+
+class EvmddCache(object):
+    """A cache of the results of `term_to_evmdd` in a local directory.
+
+    Each result is keyed on a normalized form of the function term, i.e., its
+    abstract syntax tree, together with the resolved variable order, domain
+    sizes and reduction type. Hence, terms that only differ in whitespace or
+    redundant parentheses share one entry, as do calls that lead to the same
+    variables, e.g., with and without explicitly given default domain sizes.
+
+    Results are stored in the binary format of `evmdd.serialize`, in a
+    subdirectory of `directory` named after the format version, which is
+    marked as owned by the cache. When the format version changes, the marked
+    subdirectories of other versions are removed, while other contents of
+    `directory` are left alone. Temporary files left over from processes
+    killed while writing a result are removed when a cache is created.
+    When the files exceed `max_bytes` in total, the least recently used files
+    are evicted. The sizes and times of last use of the files are read from
+    the directory once, when the cache is created, and tracked in memory
+    afterwards. In front of the directory, up to `memory_capacity` results
+    are kept in memory with LRU eviction.
+
+    Results taken from the cache are shared: the same |EVMDD| and manager
+    are returned for repeated calls with the same key, as long as the
+    variable order of the manager has not been changed by reordering (see
+    `EvmddManager.sift`). Once it has, the result is no longer returned from
+    memory, but loaded again.
+
+    Example:
+        >>> import tempfile
+        >>> cache = EvmddCache(tempfile.mkdtemp())
+        >>> evmdd, manager = cache.term_to_evmdd('A*B + C', var_names=['A', 'B', 'C'])
+        >>> cache.term_to_evmdd('(A * B) + C', var_names=['A', 'B', 'C'])[0] is evmdd
+        True
+        >>> fresh_cache = EvmddCache(cache.directory, memory_capacity=0)
+        >>> loaded, loaded_manager = fresh_cache.term_to_evmdd('A*B + C')
+        >>> fresh_cache.disk_hits, loaded.num_nodes() == evmdd.num_nodes()
+        (1, True)
+
+        Only subdirectories created by a cache are removed, and stale
+        temporary files are swept:
+
+        >>> import os, time
+        >>> directory = tempfile.mkdtemp()
+        >>> os.mkdir(os.path.join(directory, 'v0'))
+        >>> open(os.path.join(directory, 'v0', 'data.evmdd'), 'w').close()
+        >>> os.mkdir(os.path.join(directory, 'v1'))
+        >>> stale = os.path.join(directory, 'v1', 'tmpabc.tmp')
+        >>> open(stale, 'w').close()
+        >>> os.utime(stale, (time.time() - 2 * _STALE_TEMP_AGE,) * 2)
+        >>> _ = EvmddCache(directory)
+        >>> os.listdir(os.path.join(directory, 'v0'))
+        ['data.evmdd']
+        >>> os.listdir(os.path.join(directory, 'v1'))
+        ['.pyevmdd-cache']
+    """
+
+    def __init__(self, directory, max_bytes=1 << 28, memory_capacity=128):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._version_directory = os.path.join(directory, 'v%d' % FORMAT_VERSION)
+        os.makedirs(self._version_directory, exist_ok=True)
+        open(os.path.join(self._version_directory, _MARKER), 'a').close()
+        self._remove_other_versions()
+        self._remove_stale_temp_files()
+        # Map each cached file to its time of last use and its size.
+        self._file_index = {path: (mtime, size) for mtime, size, path in self._files()}
+        self._total_size = sum([size for _, size in self._file_index.values()])
+        self._memory = ComputedTable(capacity=max(memory_capacity, 1), num_locks=1)
+        self._memory_capacity = memory_capacity
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _remove_other_versions(self):
+        """Remove cached files written in other format versions."""
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if (name.startswith('v') and name[1:].isdigit() and
+                    path != self._version_directory and
+                    os.path.isfile(os.path.join(path, _MARKER))):
+                for file_name in os.listdir(path):
+                    if file_name.endswith((_SUFFIX, _TEMP_SUFFIX)):
+                        try:
+                            os.remove(os.path.join(path, file_name))
+                        except OSError:
+                            pass
+                try:
+                    os.remove(os.path.join(path, _MARKER))
+                    os.rmdir(path)
+                except OSError:
+                    pass
+
+    def _remove_stale_temp_files(self):
+        """Remove temporary files of processes killed while writing a result.
+
+        Recent temporary files may still be written by other processes and
+        are kept.
+        """
+        now = time.time()
+        for name in os.listdir(self._version_directory):
+            if name.endswith(_TEMP_SUFFIX):
+                path = os.path.join(self._version_directory, name)
+                try:
+                    if now - os.stat(path).st_mtime > _STALE_TEMP_AGE:
+                        os.remove(path)
+                except OSError:
+                    pass
+
+    def _key(self, function_term, kwargs):
+        function_term_ast = read_function_term(function_term)
+        var_names, var_domains, fully_reduced = _resolve_variables(function_term_ast, kwargs)
+        normalized = (ast.dump(function_term_ast), tuple(var_names),
+                      tuple(var_domains), bool(fully_reduced))
+        return hashlib.sha256(repr(normalized).encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self._version_directory, key + _SUFFIX)
+
+    def _files(self):
+        """Get the cached files in the directory as a list of ``(time of last
+        use, size, path)``."""
+        files = []
+        for name in os.listdir(self._version_directory):
+            if name.endswith(_SUFFIX):
+                path = os.path.join(self._version_directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+        return files
+
+    def _evict(self):
+        """Remove least recently used files until the size limit is met."""
+        files = sorted([(mtime, size, path) for path, (mtime, size)
+                        in self._file_index.items()])
+        for _, size, path in files:
+            if self._total_size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            del self._file_index[path]
+            self._total_size -= size
+
+    def _load(self, path):
+        """Load a cached result, or return `None` if there is no valid one."""
+        try:
+            compact, manager = load_evmdd(path, use_mmap=False)
+        except (OSError, ValueError):
+            return None
+        os.utime(path)
+        if path in self._file_index:
+            self._file_index[path] = (time.time(), self._file_index[path][1])
+        return manager.expand(compact), manager
+
+    def _store(self, path, evmdd, manager):
+        """Write a result atomically, such that concurrent readers never see
+        partially written files.
+
+        Results with weights that do not fit into the 64-bit integers of the
+        binary format are not written, and only kept in memory.
+        """
+        descriptor, temp_path = tempfile.mkstemp(suffix=_TEMP_SUFFIX, dir=self._version_directory)
+        os.close(descriptor)
+        try:
+            save_evmdd(evmdd, manager, temp_path)
+            size = os.path.getsize(temp_path)
+            os.replace(temp_path, path)
+        except (OSError, OverflowError, struct.error):
+            return
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        _, old_size = self._file_index.get(path, (None, 0))
+        self._file_index[path] = (time.time(), size)
+        self._total_size += size - old_size
+        if self._total_size > self.max_bytes:
+            self._evict()
+
+    def term_to_evmdd(self, function_term, **kwargs):
+        """Translate a function term to an |EVMDD| using the cache.
+
+        Takes the same arguments and returns the same as `term_to_evmdd`.
+
+        Example:
+            >>> import os, tempfile
+            >>> cache = EvmddCache(tempfile.mkdtemp())
+            >>> evmdd, manager = cache.term_to_evmdd('A**40', var_names=['A'],
+            ...                                      var_domains={'A': 4})
+            >>> from evmdd import evaluate
+            >>> evaluate(evmdd, {'A': 3}, manager) == 3**40
+            True
+            >>> [name for name in os.listdir(cache._version_directory)
+            ...  if not name.startswith('.')]
+            []
+        """
+        key = self._key(function_term, kwargs)
+        if self._memory_capacity:
+            entry = self._memory.lookup(key)
+            if entry is not None:
+                evmdd, manager, order_version = entry
+                if manager.order_version == order_version:
+                    self.memory_hits += 1
+                    return evmdd, manager
+        path = self._path(key)
+        result = self._load(path)
+        if result is not None:
+            self.disk_hits += 1
+        else:
+            self.misses += 1
+            result = term_to_evmdd(function_term, **kwargs)
+            self._store(path, *result)
+        if self._memory_capacity:
+            evmdd, manager = result
+            self._memory.insert(key, (evmdd, manager, manager.order_version))
+        return result
+
+    def clear(self):
+        """Remove all cached results from memory and disk."""
+        self._memory.flush()
+        for _, _, path in self._files():
+            os.remove(path)
+        self._file_index = {}
+        self._total_size = 0
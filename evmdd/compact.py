@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of the EVMDD Library for Python (pyevmdd).
+# Copyright (C) 2016 Robert Mattmüller
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Compact, array-backed storage of |EVMDDs|.
+
+A `CompactEvmdd` stores an |EVMDD| as a handful of contiguous arrays instead of
+one Python object per node and edge. Nodes are identified by their index in
+these arrays. The sink node always has index 0, and nodes are numbered in
+depth-first post-order, such that children always have smaller indices than
+their parents.
+"""
+
+import operator
+from array import array
+from numbers import Integral
+
+from .evmdd import Edge, Node, POSTORDER, _make_sink_node
+
+_LEVEL_TYPECODE = 'i'
+_INDEX_TYPECODE = 'q'
+_WEIGHT_TYPECODE = 'q'
+
+SINK_INDEX = 0
+
+class CompactEvmdd(object):
+    """An |EVMDD| stored in struct-of-arrays form.
+
+    The arrays are:
+
+    * `levels`: the level of each node.
+    * `child_offsets`: for each node `i`, the outgoing edges of `i` are the
+      edges with indices ``child_offsets[i]`` up to (excluding)
+      ``child_offsets[i+1]``, ordered by domain value. This array has one more
+      entry than there are nodes.
+    * `child_weights`: the weight of each edge.
+    * `child_succs`: the index of the successor node of each edge.
+
+    Additionally, the dangling incoming edge is given by `root_weight` and the
+    index `root` of its successor node, and `is_fully_reduced` records the
+    reduction type.
+
+    Weights are stored as 64-bit integers. Converting an |EVMDD| with larger
+    weights raises an `OverflowError`. Instead of `array.array` objects, the
+    arrays can also be `memoryview` objects of the same item types, e.g.,
+    views of a memory-mapped file (see `serialize.load_evmdd`).
+
+    Compact |EVMDDs| are immutable. They support evaluation (see `evaluate`)
+    and the arithmetic operators of `Edges` directly on the arrays, without
+    creating `Nodes` and `Edges`. The result of an operator is a new compact
+    |EVMDD| with its own arrays, which shares the `manager` of the operands.
+
+    Levels refer to the variable order of `manager` at the time of creation,
+    which is recorded in `order_version`. Once the variable order has been
+    changed by reordering (see `EvmddManager.sift`), the compact |EVMDD| is
+    stale, and using it raises a `ValueError`.
+
+    Example:
+        >>> from .evmdd import EvmddManager
+        >>> from .parser import term_to_evmdd
+        >>> from .reorder import swap_adjacent_levels
+        >>> evmdd, manager = term_to_evmdd('A*B + 3*C', var_names=['A', 'B', 'C'])
+        >>> compact = manager.compact(evmdd)
+        >>> compact.evaluate({'A': 1, 'B': 1, 'C': 0})
+        1
+        >>> swap_adjacent_levels(manager, 2)
+        >>> compact.evaluate({'A': 1, 'B': 1, 'C': 0})
+        Traceback (most recent call last):
+            ...
+        ValueError: Variable order of the manager changed since the compact EVMDD was created.
+        >>> manager.compact(evmdd).evaluate({'A': 1, 'B': 1, 'C': 0})
+        1
+    """
+
+    def __init__(self, levels, child_offsets, child_weights, child_succs,
+                 root_weight, root, is_fully_reduced, manager=None):
+        assert len(child_offsets) == len(levels) + 1
+        assert len(child_weights) == len(child_succs) == child_offsets[-1]
+        self.levels = levels
+        self.child_offsets = child_offsets
+        self.child_weights = child_weights
+        self.child_succs = child_succs
+        self.root_weight = root_weight
+        self.root = root
+        self.is_fully_reduced = is_fully_reduced
+        self.manager = manager
+        self.order_version = manager.order_version if manager else None
+
+    def _check_order_version(self):
+        """Raise a `ValueError` if the variable order of the manager has
+        changed since this compact |EVMDD| was created."""
+        if self.manager and self.manager.order_version != self.order_version:
+            raise ValueError('Variable order of the manager changed since the '
+                             'compact EVMDD was created.')
+
+    @classmethod
+    def from_evmdd(cls, evmdd, manager=None):
+        """Convert an |EVMDD| given by its dangling incoming edge.
+
+        Args:
+            `evmdd` (Edge): an |EVMDD|.
+
+            `manager` (EvmddManager, optional): the manager of `evmdd`.
+
+        Returns:
+            `CompactEvmdd`: the equivalent compact |EVMDD|.
+        """
+        levels = array(_LEVEL_TYPECODE)
+        child_offsets = array(_INDEX_TYPECODE, [0])
+        child_weights = array(_WEIGHT_TYPECODE)
+        child_succs = array(_INDEX_TYPECODE)
+        index = {}
+        for node in evmdd.iter_nodes(POSTORDER):
+            index[node.id] = len(levels)
+            levels.append(node.level)
+            for child in node.children:
+                child_weights.append(child.weight)
+                child_succs.append(index[child.succ.id])
+            child_offsets.append(len(child_weights))
+        assert index[evmdd.succ.id] == len(levels) - 1
+        return cls(levels, child_offsets, child_weights, child_succs,
+                   evmdd.weight, len(levels) - 1, evmdd.is_fully_reduced, manager)
+
+    def to_evmdd(self, manager=None):
+        """Expand this compact |EVMDD| into `Nodes` and `Edges`.
+
+        Args:
+            `manager` (EvmddManager, optional): the manager into whose node
+            store the |EVMDD| is expanded. Defaults to the manager of this
+            compact |EVMDD|.
+
+        Returns:
+            `Edge`: the equivalent |EVMDD|.
+        """
+        self._check_order_version()
+        manager = manager or self.manager
+        store = manager._store if manager else None
+        fully_reduced = self.is_fully_reduced
+        nodes = [_make_sink_node(fully_reduced, store)]
+        for idx in range(1, len(self.levels)):
+            start, end = self.child_offsets[idx], self.child_offsets[idx+1]
+            children = [Edge(weight=self.child_weights[e],
+                             succ=nodes[self.child_succs[e]],
+                             is_fully_reduced=fully_reduced)
+                        for e in range(start, end)]
+            nodes.append(Node(self.levels[idx], children, fully_reduced))
+        return Edge(weight=self.root_weight, succ=nodes[self.root],
+                    is_fully_reduced=fully_reduced)
+
+    def num_nodes(self):
+        """Get the number of nodes in this |EVMDD|."""
+        return len(self.levels)
+
+    def num_edges(self):
+        """Get the number of edges in this |EVMDD|."""
+        return len(self.child_weights) + 1
+
+    def nbytes(self):
+        """Get the number of bytes occupied by the arrays of this |EVMDD|."""
+        return sum([arr.itemsize * len(arr) for arr in
+                    (self.levels, self.child_offsets,
+                     self.child_weights, self.child_succs)])
+
+    def evaluate(self, valuation, manager=None):
+        """Evaluate this compact |EVMDD| for a given valuation.
+
+        See `evmdd.evaluate`.
+        """
+        self._check_order_version()
+        manager = manager or self.manager
+        levels = self.levels
+        child_offsets = self.child_offsets
+        child_weights = self.child_weights
+        child_succs = self.child_succs
+        node = self.root
+        result = self.root_weight
+        while node != SINK_INDEX:
+            var_value = valuation[manager._level_to_var_name(levels[node])]
+            start = child_offsets[node]
+            assert 0 <= var_value < child_offsets[node+1] - start
+            edge = start + var_value
+            result += child_weights[edge]
+            node = child_succs[edge]
+        return result
+
+    def _apply(self, other, oper):
+        """Apply an arithmetic operator directly on the arrays of the operands.
+
+        `other` can be a `CompactEvmdd`, an `Edge`, or an integer constant.
+        """
+        if isinstance(other, Edge):
+            other = CompactEvmdd.from_evmdd(other, self.manager)
+        elif not isinstance(other, CompactEvmdd):
+            assert isinstance(other, Integral)
+            other = _make_const_compact(other, self.is_fully_reduced, self.manager)
+        if self.is_fully_reduced != other.is_fully_reduced:
+            raise ValueError('Cannot mix fully reduced and quasi-reduced EVMDDs.')
+        self._check_order_version()
+        other._check_order_version()
+        return _CompactApply(self, other, oper).result()
+
+    def __add__(self, other):
+        return self._apply(other, operator.add)
+
+    def __sub__(self, other):
+        return self._apply(other, operator.sub)
+
+    def __mul__(self, other):
+        return self._apply(other, operator.mul)
+
+    def __neg__(self):
+        return _make_const_compact(0, self.is_fully_reduced, self.manager) - self
+
+    def __pow__(self, other):
+        if not isinstance(other, Integral) or other < 0:
+            raise ValueError("EVMDDs may only be raised to a nonnegative integral power.")
+        result = _make_const_compact(1, self.is_fully_reduced, self.manager)
+        base = self
+        while other:
+            if other & 1:
+                result = result * base
+            other >>= 1
+            if other:
+                base = base * base
+        return result
+
+    def __repr__(self):
+        return ('CompactEvmdd(nodes=%s,edges=%s,root_weight=%s,is_fully_reduced=%s)' %
+                (self.num_nodes(), self.num_edges(), self.root_weight,
+                 self.is_fully_reduced))
+
+
+def _make_const_compact(number, is_fully_reduced, manager=None):
+    """Construct the compact |EVMDD| representing a constant number."""
+    return CompactEvmdd(array(_LEVEL_TYPECODE, [0]), array(_INDEX_TYPECODE, [0, 0]),
+                        array(_WEIGHT_TYPECODE), array(_INDEX_TYPECODE),
+                        number, SINK_INDEX, is_fully_reduced, manager)
+
+class _CompactApply(object):
+    """Application of an arithmetic operator to two compact |EVMDDs|.
+
+    This follows `Edge._compute_apply`, but operates on ``(weight, node
+    index)`` pairs of the two operands and writes the result into new
+    arrays. Result nodes are hash-consed in a dict keyed on their level and
+    children, so the result is reduced like an |EVMDD| built from `Nodes`
+    and `Edges`, and no `Node` or `Edge` objects are created. Additive
+    operators factor out the weights of the incoming edges, and constant
+    operands are handled by shifting or rescaling, without recursion over
+    pairs of nodes.
+    """
+
+    def __init__(self, first, second, oper):
+        self._operands = (first, second)
+        self._oper = oper
+        self._is_additive = oper is not operator.mul
+        self._is_fully_reduced = first.is_fully_reduced
+        self._manager = first.manager or second.manager
+        self._levels = array(_LEVEL_TYPECODE, [0])
+        self._child_offsets = array(_INDEX_TYPECODE, [0, 0])
+        self._child_weights = array(_WEIGHT_TYPECODE)
+        self._child_succs = array(_INDEX_TYPECODE)
+        self._unique_table = {}
+        self._computed_table = {}
+        self._scale_table = {}
+
+    def result(self):
+        first, second = self._operands
+        weight, node = self._apply(first.root_weight, first.root,
+                                   second.root_weight, second.root)
+        return CompactEvmdd(self._levels, self._child_offsets, self._child_weights,
+                            self._child_succs, weight, node, self._is_fully_reduced,
+                            self._manager)
+
+    def _make_node(self, level, children):
+        """Get the normalized and, if possible, Shannon-reduced result node on
+        `level` with the given ``(weight, index)`` pairs as children."""
+        min_weight = min([weight for weight, _ in children])
+        children = tuple([(weight - min_weight, succ) for weight, succ in children])
+        if self._is_fully_reduced and all([child == children[0] for child in children]):
+            return min_weight, children[0][1]
+        key = (level, children)
+        node = self._unique_table.get(key)
+        if node is None:
+            node = len(self._levels)
+            self._levels.append(level)
+            for weight, succ in children:
+                self._child_weights.append(weight)
+                self._child_succs.append(succ)
+            self._child_offsets.append(len(self._child_weights))
+            self._unique_table[key] = node
+        return min_weight, node
+
+    def _children(self, operand, node):
+        compact = self._operands[operand]
+        start, end = compact.child_offsets[node], compact.child_offsets[node+1]
+        return [(compact.child_weights[e], compact.child_succs[e]) for e in range(start, end)]
+
+    def _scale_node(self, operand, node, factor):
+        """Copy the node `node` of an operand into the result, multiplied with
+        `factor`, and return the ``(offset, index)`` pair of the copy."""
+        if node == SINK_INDEX:
+            return 0, SINK_INDEX
+        key = (operand, node, factor)
+        result = self._scale_table.get(key)
+        if result is None:
+            children = []
+            for weight, succ in self._children(operand, node):
+                offset, index = self._scale_node(operand, succ, factor)
+                children.append((factor * weight + offset, index))
+            result = self._make_node(self._operands[operand].levels[node], children)
+            self._scale_table[key] = result
+        return result
+
+    def _scale(self, operand, weight, node, factor):
+        """Multiply the sub-|EVMDD| ``(weight, node)`` of an operand with a
+        constant (see `evmdd._scale`)."""
+        if factor == 0 and self._is_fully_reduced:
+            return 0, SINK_INDEX
+        offset, index = self._scale_node(operand, node, factor)
+        return factor * weight + offset, index
+
+    def _apply(self, first_weight, first_node, second_weight, second_node):
+        oper = self._oper
+        if second_node == SINK_INDEX:
+            if oper is operator.mul:
+                return self._scale(0, first_weight, first_node, second_weight)
+            offset, index = self._scale_node(0, first_node, 1)
+            return oper(first_weight, second_weight) + offset, index
+        if first_node == SINK_INDEX:
+            if oper is operator.mul:
+                return self._scale(1, second_weight, second_node, first_weight)
+            factor = 1 if oper is operator.add else -1
+            weight, index = self._scale(1, second_weight, second_node, factor)
+            return first_weight + weight, index
+        if self._is_additive and (first_weight != 0 or second_weight != 0):
+            weight, index = self._apply(0, first_node, 0, second_node)
+            return oper(first_weight, second_weight) + weight, index
+
+        key = (first_weight, first_node, second_weight, second_node)
+        result = self._computed_table.get(key)
+        if result is None:
+            first_level = self._operands[0].levels[first_node]
+            second_level = self._operands[1].levels[second_node]
+            if first_level >= second_level:
+                first_children = [(weight + first_weight, succ) for weight, succ
+                                  in self._children(0, first_node)]
+            if second_level >= first_level:
+                second_children = [(weight + second_weight, succ) for weight, succ
+                                   in self._children(1, second_node)]
+            if first_level < second_level:
+                first_children = len(second_children) * [(first_weight, first_node)]
+            if second_level < first_level:
+                second_children = len(first_children) * [(second_weight, second_node)]
+            children = [self._apply(first_child[0], first_child[1],
+                                    second_child[0], second_child[1])
+                        for first_child, second_child in zip(first_children,
+                                                             second_children)]
+            result = self._make_node(max(first_level, second_level), children)
+            self._computed_table[key] = result
+        return result
+
+
+class CompiledEvmdd(object):
+    """An |EVMDD| compiled into a callable for fast repeated evaluation.
+
+    All variable names and domain sizes are resolved and all structural checks
+    are performed once, at compile time. For each inner node, the jump table
+    stores the position and name of its variable in the variable order of the
+    manager, and a tuple of ``(weight, successor)`` pairs indexed by the value
+    of that variable. Evaluating a valuation then only follows the jump table.
+
+    Calling a compiled |EVMDD| with a valuation returns the same value as
+    `evaluate`. The valuation can be given either as a dict from variable
+    names to values, or as a sequence of values in the variable order of the
+    manager. Values are not range-checked when calling.
+    """
+
+    def __init__(self, compact, manager):
+        compact._check_order_version()
+        var_domains = manager._var_domains
+        num_vars = len(var_domains)
+        jump_table = [None]
+        for idx in range(1, compact.num_nodes()):
+            level = compact.levels[idx]
+            if not 1 <= level <= num_vars:
+                raise ValueError('Node level %d unknown to manager.' % level)
+            start = compact.child_offsets[idx]
+            end = compact.child_offsets[idx+1]
+            if end - start != manager._level_to_domain_size(level):
+                raise ValueError('Node at level %d does not match domain size.' % level)
+            children = tuple([(compact.child_weights[e], compact.child_succs[e])
+                              for e in range(start, end)])
+            assert min([weight for weight, _ in children]) == 0
+            jump_table.append((num_vars - level, manager._level_to_var_name(level),
+                               children))
+        self._jump_table = jump_table
+        self._root = compact.root
+        self._root_weight = compact.root_weight
+
+    def __call__(self, valuation):
+        jump_table = self._jump_table
+        node = self._root
+        result = self._root_weight
+        if isinstance(valuation, dict):
+            while node:
+                _, var_name, children = jump_table[node]
+                weight, node = children[valuation[var_name]]
+                result += weight
+        else:
+            while node:
+                position, _, children = jump_table[node]
+                weight, node = children[valuation[position]]
+                result += weight
+        return result
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of the EVMDD Library for Python (pyevmdd).
+# Copyright (C) 2016 Robert Mattmüller
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Conversion between |EVMDDs| and dense value tables.
+
+A value table of a manager with variables :math:`v_1, \\dots, v_n` (in the
+variable order of the manager) is an array of shape
+:math:`(|D_1|, \\dots, |D_n|)`, whose entry at index :math:`(d_1, \\dots,
+d_n)` is the function value for the valuation :math:`v_i = d_i`.
+
+`to_array` computes the table of every node of an |EVMDD| once, bottom-up,
+over the variables on its level and below. The table of a node stacks the
+tables of its children, shifted by the weights of the child edges, where the
+tables of children on lower levels are broadcast over the skipped variables.
+
+`from_array` builds an |EVMDD| from a table level by level, starting at the
+bottom. On each level, the table is cut into rows over the variable of that
+level, each row is normalized by its minimal weight, and one node is created
+per distinct row. The row minima and the indices of the distinct rows then
+form the table of the next level up.
+
+This module requires `NumPy <http://www.numpy.org/>`_.
+"""
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .evmdd import Edge, POSTORDER, _make_node_evmdd, _make_sink_node
+
+def _require_numpy():
+    if np is None:
+        raise ImportError('Conversion between EVMDDs and arrays requires NumPy.')
+
+def to_array(evmdd, manager):
+    """Compute the table of all values of an |EVMDD|.
+
+    Args:
+        `evmdd` (Edge): an |EVMDD|.
+
+        `manager` (EvmddManager): the manager of `evmdd`.
+
+    Returns:
+        `numpy.ndarray`: an array of 64-bit integers with one axis per
+        variable of `manager`, in its variable order, holding the value of
+        `evmdd` for each valuation.
+
+    Example:
+        >>> from .parser import term_to_evmdd
+        >>> evmdd, manager = term_to_evmdd('A*B**2 + C + 2',
+        ...     var_names=['A', 'B', 'C'], var_domains={'A': 2, 'B': 3, 'C': 2})
+        >>> table = to_array(evmdd, manager)
+        >>> table.shape
+        (2, 3, 2)
+        >>> table[1]
+        array([[2, 3],
+               [3, 4],
+               [6, 7]])
+    """
+    _require_numpy()
+    var_domains = tuple(manager._var_domains)
+    num_vars = len(var_domains)
+    tables = {}
+    for node in evmdd.iter_nodes(POSTORDER):
+        if node.is_sink_node():
+            table = np.zeros((), dtype=np.int64)
+        else:
+            # Children on lower levels are broadcast over the skipped axes.
+            table = np.empty(var_domains[num_vars - node.level:], dtype=np.int64)
+            for value, child in enumerate(node.children):
+                table[value] = tables[child.succ.id] + child.weight
+        tables[node.id] = table
+    table = tables[evmdd.succ.id] + evmdd.weight
+    if table.shape != var_domains:
+        table = np.broadcast_to(table, var_domains).copy()
+    return table
+
+def from_array(array, manager):
+    """Build the |EVMDD| with given table of values.
+
+    Args:
+        `array` (array of ints): the table of values, with one axis per
+        variable of `manager`, in its variable order (see `to_array`).
+
+        `manager` (EvmddManager): the manager of the new |EVMDD|.
+
+    Returns:
+        `Edge`: the |EVMDD| of `manager` representing `array`.
+
+    Example:
+        >>> from .evmdd import EvmddManager
+        >>> manager = EvmddManager(['A', 'B'], [2, 3])
+        >>> evmdd = from_array([[0, 1, 2], [1, 2, 3]], manager)
+        >>> a = manager.make_var_evmdd_for_var('A')
+        >>> b = manager.make_var_evmdd_for_var('B')
+        >>> evmdd is a + b
+        True
+    """
+    _require_numpy()
+    var_domains = tuple(manager._var_domains)
+    array = np.asarray(array)
+    if array.shape != var_domains:
+        raise ValueError('Expected an array of shape %s, got %s.' %
+                         (var_domains, array.shape))
+    if not np.issubdtype(array.dtype, np.integer):
+        raise ValueError('Expected an array of integers, got %s.' % array.dtype)
+    is_fully_reduced = manager._fully_reduced
+
+    # The table of the current level: the weight of the incoming edge and the
+    # index in `succs` of the successor node, for each valuation of the
+    # variables above.
+    weights = array.astype(np.int64).reshape(-1)
+    indices = np.zeros(weights.shape, dtype=np.int64)
+    succs = [_make_sink_node(is_fully_reduced, manager._store)]
+    for level in range(1, len(var_domains) + 1):
+        domain_size = manager._level_to_domain_size(level)
+        weights = weights.reshape(-1, domain_size)
+        indices = indices.reshape(-1, domain_size)
+        min_weights = weights.min(axis=1)
+        rows = np.concatenate((weights - min_weights[:, None], indices), axis=1)
+        distinct_rows, inverse = np.unique(rows, axis=0, return_inverse=True)
+        level_succs = []
+        for row in distinct_rows.tolist():
+            children = [Edge(weight, succs[index], is_fully_reduced)
+                        for weight, index in zip(row[:domain_size], row[domain_size:])]
+            level_succs.append(_make_node_evmdd(level, children, is_fully_reduced).succ)
+        weights = min_weights
+        indices = inverse.reshape(-1)
+        succs = level_succs
+    return Edge(int(weights[0]), succs[indices[0]], is_fully_reduced)
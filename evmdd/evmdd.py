@@ -23,20 +23,108 @@ via Nodes and Edges, for arithmetic operations on them, and for the computation
 of function values.
 
 It supports quasi-reduced and fully reduced |EVMDDs|, but does not allow mixing
-them. Many functions and methods have an optional boolean parameter
-``fully_reduced`` or ``is_fully_reduced`` that determines whether they are
-supposed to deal with fully reduced (if true) or quasi-reduced (if false)
-|EVMDDs|.
+them in arithmetic operations. Many functions and methods have an optional
+boolean parameter ``fully_reduced`` or ``is_fully_reduced`` that determines
+whether they are supposed to deal with fully reduced (if true) or
+quasi-reduced (if false) |EVMDDs|. A manager can convert between both types
+(see `EvmddManager.to_quasi_reduced` and `EvmddManager.to_fully_reduced`).
 """
 
+import heapq
 import logging
+import threading
 from numbers import Integral
+from sys import getsizeof
+from time import perf_counter
 
-from .util import memoize, EqualityMixin
+from .util import UniqueTable, ComputedTable
 
 _DEFAULT_IS_FULLY_REDUCED = True
 
-def _make_sink_node(is_fully_reduced=_DEFAULT_IS_FULLY_REDUCED):
+_LOGGER = logging.getLogger()
+
+class ApplyStatistics(object):
+    """Counters describing the work done by the apply engine of a node store.
+
+    Lookups in the unique and computed tables are counted by the tables
+    themselves. This class counts applications of arithmetic operators
+    (`apply_calls`, by operator name), how many of them were terminal,
+    constant-operand, or recursive cases (`terminal_cases`, `constant_cases`,
+    `recursive_cases`), the maximal nesting
+    depth of applications (`peak_depth`), and the cumulative wall-clock time
+    spent in top-level applications (`apply_time`, in seconds).
+
+    The current nesting depth is tracked per thread in `nesting`. When
+    several threads apply operators concurrently, the counters are shared
+    and only approximate.
+    """
+
+    def __init__(self):
+        self.nesting = _Nesting()
+        self.reset()
+
+    def reset(self):
+        """Reset all counters to zero."""
+        self.apply_calls = {'__add__': 0, '__sub__': 0, '__mul__': 0}
+        self.terminal_cases = 0
+        self.constant_cases = 0
+        self.recursive_cases = 0
+        self.peak_depth = self.nesting.depth
+        self.apply_time = 0.0
+
+class _Nesting(threading.local):
+    """The nesting depth of applications in the current thread."""
+
+    def __init__(self):
+        self.depth = 0
+
+class NodeStore(object):
+    """Storage for the nodes and edges of the |EVMDDs| of one manager.
+
+    A node store owns the unique tables for nodes and edges and the computed
+    table caching results of arithmetic operations. Every node belongs to
+    exactly one store, which it records in its attribute `store`, and all
+    nodes reachable from it belong to the same store. |EVMDDs| from different
+    stores cannot be combined.
+
+    The unique tables only hold weak references, such that nodes and edges
+    that are no longer referenced are reclaimed automatically. The computed
+    table holds strong references to cached results, which therefore stay
+    alive until they are evicted or the table is flushed. The same holds for
+    the smaller `scale_table` caching multiplications by constants, and for
+    the `conversion_table` caching conversions between fully reduced and
+    quasi-reduced |EVMDDs|.
+
+    If `reorder_threshold` is set, the callable `reorder` is invoked after
+    each top-level arithmetic operation that leaves more than that many live
+    nodes in the store.
+
+    |EVMDDs| of one store can be built and evaluated by several threads
+    concurrently, since the unique tables and computed tables are
+    thread-safe. Variable reordering, however, restructures nodes in place
+    and must not run concurrently with any other operation on the store.
+    """
+
+    def __init__(self):
+        self.nodes = UniqueTable()
+        self.edges = UniqueTable()
+        self.computed_table = ComputedTable()
+        self.scale_table = ComputedTable(capacity=1 << 14)
+        self.conversion_table = ComputedTable(capacity=1 << 16)
+        self.stats = ApplyStatistics()
+        self.reorder_threshold = None
+        self.reorder = None
+
+    def flush_caches(self):
+        """Remove all entries from the computed table, the scale table and the
+        conversion table."""
+        self.computed_table.flush()
+        self.scale_table.flush()
+        self.conversion_table.flush()
+
+_DEFAULT_STORE = NodeStore()
+
+def _make_sink_node(is_fully_reduced=_DEFAULT_IS_FULLY_REDUCED, store=None):
     """Create the unique 0-sink node.
 
     Since uniqueness is only enforced among |EVMDDs| of the same type,
@@ -45,16 +133,19 @@ def _make_sink_node(is_fully_reduced=_DEFAULT_IS_FULLY_REDUCED):
     fully reduced case, and one for the quasi-reduced case.
 
     The requested type is specified by the argument `is_fully_reduced`.
+    Uniqueness is also only enforced per node `store`. If no store is given,
+    the sink node of a default store shared by all |EVMDDs| constructed
+    without a manager is returned.
     """
-    return Node(level=0, children=[], is_fully_reduced=is_fully_reduced)
+    return Node(level=0, children=[], is_fully_reduced=is_fully_reduced, store=store)
 
-def _make_const_evmdd(number, is_fully_reduced=_DEFAULT_IS_FULLY_REDUCED):
+def _make_const_evmdd(number, is_fully_reduced=_DEFAULT_IS_FULLY_REDUCED, store=None):
     """Construct an |EVMDD| representing a given constant number.
 
     This is the |EVMDD| with a single edge immediately leading to the sink
     node, labeled with the given constant as its edge weight.
     """
-    return Edge(weight=number, succ=_make_sink_node(is_fully_reduced),
+    return Edge(weight=number, succ=_make_sink_node(is_fully_reduced, store),
                 is_fully_reduced=is_fully_reduced)
 
 def _aggregate_weights(weight1, weight2, oper):
@@ -72,6 +163,14 @@ def _aggregate_weights(weight1, weight2, oper):
         assert oper is Edge.__mul__
         return weight1 * weight2
 
+def _is_additive(oper):
+    """Test if `oper` is addition or subtraction.
+
+    For these operators, constant offsets of the operands can be factored out,
+    i.e., :math:`(a + f) \\pm (b + g) = (a \\pm b) + (f \\pm g)`.
+    """
+    return oper is Edge.__add__ or oper is Edge.__sub__
+
 def _is_terminal_case(edge1, edge2):
     """Test if `edge1` and `edge2` are both sink edges with constant value.
     """
@@ -91,7 +190,91 @@ def _terminal_value(edge1, edge2, oper, is_fully_reduced):
     """
     assert _is_terminal_case(edge1, edge2)
     result_weight = _aggregate_weights(edge1.weight, edge2.weight, oper)
-    return _make_const_evmdd(number=result_weight, is_fully_reduced=is_fully_reduced)
+    return Edge(weight=result_weight, succ=edge1.succ, is_fully_reduced=is_fully_reduced)
+
+def _is_constant(edge):
+    """Test if `edge` is a sink edge with constant value."""
+    return edge.succ.is_sink_node()
+
+def _scale_node(node, factor):
+    """Multiply the function represented by `node` with a nonzero constant.
+
+    Returns an edge whose weight is the offset that results from
+    renormalizing the scaled children. For positive factors, this offset is
+    always zero. Since multiplication with a nonzero factor is injective,
+    no Shannon reductions become possible, and the resulting diagram has the
+    same shape as the given one. Results are cached in the `scale_table` of
+    the node store.
+    """
+    if node.is_sink_node():
+        return Edge(weight=0, succ=node, is_fully_reduced=node.is_fully_reduced)
+    key = (factor, node.id)
+    scale_table = node.store.scale_table
+    result = scale_table.lookup(key)
+    if result is not None:
+        return result
+    children = [_scale_node(child.succ, factor) + factor*child.weight
+                for child in node.children]
+    result_weight = min([child.weight for child in children])
+    children = [child-result_weight for child in children]
+    result = Edge(weight=result_weight,
+                  succ=Node(node.level, children, node.is_fully_reduced),
+                  is_fully_reduced=node.is_fully_reduced)
+    scale_table.insert(key, result)
+    return result
+
+def _make_zero_chain(node):
+    """Construct the quasi-reduced |EVMDD| of the constant zero on the levels
+    of the quasi-reduced `node`.
+
+    Every path from `node` visits all levels below it, so the levels and
+    domain sizes are read off the path along the first children.
+    """
+    levels = []
+    while not node.is_sink_node():
+        levels.append((node.level, len(node.children)))
+        node = node.children[0].succ
+    result = Edge(weight=0, succ=node, is_fully_reduced=False)
+    for level, domain_size in reversed(levels):
+        result = Edge(weight=0, succ=Node(level, domain_size * [result], False),
+                      is_fully_reduced=False)
+    return result
+
+def _scale(edge, factor):
+    """Multiply the |EVMDD| `edge` with the constant `factor`.
+
+    Multiplication with one is the identity, and multiplication with zero
+    yields the constant zero in the fully reduced case. In the quasi-reduced
+    case, the latter yields a chain of nodes with zero weights on the levels
+    of `edge`, like the general `apply` algorithm does.
+    """
+    if factor == 1:
+        return edge
+    if factor == 0 and edge.is_fully_reduced:
+        return _make_const_evmdd(0, True, edge.succ.store)
+    if factor == 0:
+        return _make_zero_chain(edge.succ)
+    return _scale_node(edge.succ, factor) + factor*edge.weight
+
+def _apply_to_constant(edge1, edge2, oper):
+    """Apply `oper` to two |EVMDDs| at least one of which is constant.
+
+    Adding or subtracting a constant only shifts the weight of the dangling
+    incoming edge, and multiplying with a constant rescales all weights
+    (see `_scale`). Neither requires a recursive `apply`.
+    """
+    if _is_constant(edge2):
+        if oper is Edge.__mul__:
+            return _scale(edge1, edge2.weight)
+        elif oper is Edge.__add__:
+            return edge1 + edge2.weight
+        return edge1 - edge2.weight
+    assert _is_constant(edge1)
+    if oper is Edge.__mul__:
+        return _scale(edge2, edge1.weight)
+    elif oper is Edge.__add__:
+        return edge2 + edge1.weight
+    return _scale(edge2, -1) + edge1.weight
 
 def _align_levels(edge1, edge2):
     """In case one of the |EVMDDs| to which an arithmetic operation is
@@ -105,6 +288,8 @@ def _align_levels(edge1, edge2):
 
     Generally, the weights of the current edges are pushed down to their
     respective children and only later again pulled up after aggregation.
+    For additive operators, these weights are zero (see `Edge._apply`), and
+    the children are used unchanged.
     """
     if edge1.succ.level >= edge2.succ.level:
         return [child+edge1.weight for child in edge1.succ.children]
@@ -114,6 +299,9 @@ def _align_levels(edge1, edge2):
 def _log_apply(edge1, edge2, oper, result, terminal):
     """Log result of operator application to two edges.
 
+    Formatting the operands is expensive, so callers should only call this
+    function if debug logging is enabled.
+
     Args:
         `edge1` (Edge): first edge.
 
@@ -130,7 +318,7 @@ def _log_apply(edge1, edge2, oper, result, terminal):
         place = 'terminal'
     else:
         place = 'recursive'
-    logging.debug(('%s: applying %s to\n' % (place, oper)) +
+    _LOGGER.debug(('%s: applying %s to\n' % (place, oper)) +
                   ('    %s and\n' % repr(edge1)) +
                   ('    %s results in\n' % repr(edge2)) +
                   ('    %s\n' % repr(result)))
@@ -143,21 +331,105 @@ def _perform_shannon_reduction(succ):
     to the same successor node (`first_child_succ`), then we can skip `succ`
     and immediately go to `first_child_succ`. The implementation assumes that
     successor weights are already normalized, i.e., if all children carry the
-    same weight, this is zero for all of them.
+    same weight, this is zero for all of them. Since nodes are canonical,
+    successor nodes are compared by identity.
     """
     children = succ.children
     first_child_weight = children[0].weight
     first_child_succ = children[0].succ
     if (all([child.weight == first_child_weight for child in children]) and
-            all([child.succ == first_child_succ for child in children])):
+            all([child.succ is first_child_succ for child in children])):
         assert first_child_weight == 0
         succ_after_reduction = first_child_succ
     else:
         succ_after_reduction = succ
     return succ_after_reduction
 
-@memoize
-class Edge(EqualityMixin):
+def _make_node_evmdd(level, children, is_fully_reduced):
+    """Construct the |EVMDD| branching over the variable of `level`, where
+    the sub-|EVMDD| for value `d` is given by the edge `children[d]`.
+
+    The minimal weight of the children is pulled up to the resulting edge,
+    such that the weights of the new node are normalized, and in the fully
+    reduced case, the new node is Shannon-reduced if possible.
+    """
+    result_weight = min([child.weight for child in children])
+    children = tuple([child-result_weight for child in children])
+    result_succ = Node(level, children, is_fully_reduced)
+    if is_fully_reduced:
+        result_succ = _perform_shannon_reduction(result_succ)
+    return Edge(weight=result_weight, succ=result_succ, is_fully_reduced=is_fully_reduced)
+
+def _node_key(level, children, is_fully_reduced):
+    """Get the key of a node with given level and children in a unique table."""
+    return (level, tuple([child.id for child in children]), is_fully_reduced)
+
+PREORDER = 'preorder'
+POSTORDER = 'postorder'
+LEVELORDER = 'levelorder'
+
+def _iter_preorder(root):
+    """Iterate over the nodes reachable from `root` in depth-first pre-order.
+
+    Each node is reported exactly once, before any of its descendants.
+    Children are explored in the order of their domain values.
+    """
+    visited = set([root.id])
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        yield node
+        for child in reversed(node.children):
+            succ = child.succ
+            if succ.id not in visited:
+                visited.add(succ.id)
+                stack.append(succ)
+
+def _iter_postorder(root):
+    """Iterate over the nodes reachable from `root` in depth-first post-order.
+
+    Each node is reported exactly once, after all of its descendants.
+    """
+    visited = set([root.id])
+    stack = [(root, 0)]
+    while stack:
+        node, child_idx = stack.pop()
+        if child_idx < len(node.children):
+            stack.append((node, child_idx + 1))
+            succ = node.children[child_idx].succ
+            if succ.id not in visited:
+                visited.add(succ.id)
+                stack.append((succ, 0))
+        else:
+            yield node
+
+def _iter_levelorder(root):
+    """Iterate over the nodes reachable from `root` level by level, top-down.
+
+    Nodes are reported in order of decreasing level. Since all edges lead to
+    nodes on lower levels, a node is only reported after all of its
+    predecessors. Nodes on the same level are reported in order of discovery.
+    """
+    visited = set([root.id])
+    queue = [(-root.level, 0, root)]
+    discovered = 1
+    while queue:
+        _, _, node = heapq.heappop(queue)
+        yield node
+        for child in node.children:
+            succ = child.succ
+            if succ.id not in visited:
+                visited.add(succ.id)
+                heapq.heappush(queue, (-succ.level, discovered, succ))
+                discovered += 1
+
+_TRAVERSALS = {
+    PREORDER: _iter_preorder,
+    POSTORDER: _iter_postorder,
+    LEVELORDER: _iter_levelorder,
+}
+
+class Edge(object):
     """An edge in an |EVMDD|, specifying weight and successor node.
 
     The `weight` of an edge `e` is the partial function value associated with
@@ -176,43 +448,128 @@ class Edge(EqualityMixin):
     collection `succ`, i.e., ``len(succ) == 1`` must hold for this edge. Since
     |EVMDDs| can be identified by their dangling incoming edge, we do not need
     a separate `EVMDD` class, but rather use `Edges` to represent |EVMDDs|.
+
+    Edges are hash-consed: constructing an edge with the same weight, successor
+    node and reduction type as an existing edge returns the existing edge. Each
+    edge carries a unique integer `id` assigned at creation. Since edges are
+    canonical, equality is identity, and the hash is that of the `id`, which
+    the unique table assigns before the edge becomes visible to other
+    threads. Both take constant time, independently of the size of the
+    |EVMDD| below the edge.
     """
 
-    def __init__(self, weight, succ, is_fully_reduced=_DEFAULT_IS_FULLY_REDUCED):
-        """Initialize an `Edge` with weight and successor node."""
-        self.weight = weight
-        self.succ = succ
-        self.is_fully_reduced = is_fully_reduced
+    __slots__ = ('weight', 'succ', 'is_fully_reduced', 'id', '__weakref__')
+
+    def __new__(cls, weight, succ, is_fully_reduced=_DEFAULT_IS_FULLY_REDUCED):
+        """Get the unique `Edge` with given weight and successor node.
+
+        The edge belongs to the node store of its successor node.
+        """
+        key = (weight, succ.id, is_fully_reduced)
+        unique_table = succ.store.edges
+        edge = unique_table.lookup(key)
+        if edge is None:
+            edge = super(Edge, cls).__new__(cls)
+            edge.weight = weight
+            edge.succ = succ
+            edge.is_fully_reduced = is_fully_reduced
+            edge = unique_table.insert(key, edge)
+        return edge
 
     def nodes(self):
         """Get all nodes in the (sub-) |EVMDD| rooted at this edge."""
         return self.succ.nodes()
 
+    def iter_nodes(self, order=PREORDER):
+        """Iterate over all nodes in the (sub-) |EVMDD| rooted at this edge.
+
+        See `Node.iter_nodes`.
+        """
+        return self.succ.iter_nodes(order)
+
     def num_nodes(self):
         """Get the number of nodes in this |EVMDD|."""
-        return len(self.nodes())
+        return sum(1 for _ in self.iter_nodes())
 
     def num_edges(self):
         """Get the number of edges in this |EVMDD|."""
-        return sum([len(node.children) for node in self.nodes()]) + 1
+        return sum(len(node.children) for node in self.iter_nodes()) + 1
 
     def _apply(self, other, oper):
         """Apply an arithmetic operator `oper` to two |EVMDDs| `self` and `other`.
 
+        This wrapper around `_compute_apply` records the application in the
+        statistics of the node store, and triggers automatic variable
+        reordering if enabled.
+        """
+        store = self.succ.store
+        stats = store.stats
+        stats.apply_calls[oper.__name__] += 1
+        nesting = stats.nesting
+        depth = nesting.depth
+        if depth == 0:
+            start = perf_counter()
+        nesting.depth = depth + 1
+        if depth >= stats.peak_depth:
+            stats.peak_depth = depth + 1
+        try:
+            result = self._compute_apply(other, oper)
+        finally:
+            nesting.depth = depth
+            if depth == 0:
+                stats.apply_time += perf_counter() - start
+        if (depth == 0 and store.reorder_threshold is not None and
+                len(store.nodes) > store.reorder_threshold):
+            store.reorder()
+        return result
+
+    def _compute_apply(self, other, oper):
+        """Compute the result of applying `oper` to `self` and `other`.
+
         See:
 
         * Ciardo and Siminiceanu, Using Edge-Valued Decision Diagrams for
           Symbolic Generation of Shortest Paths, FMCAD 2002, Algorithm `UnionMin`.
         * Pedram and Vrudhula, Edge-Valued Binary-Decision Diagrams,
           Algorithm `apply`.
+
+        Results of non-terminal applications are cached in the computed table,
+        keyed on the operator and the weights and successor node IDs of the
+        operands. For addition and subtraction, the weights of the dangling
+        incoming edges are stripped before the operator is applied to the
+        successor nodes and added back to the result afterwards, such that
+        operands differing only by constant offsets share cache entries.
         """
         assert self.is_fully_reduced == other.is_fully_reduced
+        assert self.succ.store is other.succ.store
 
+        stats = self.succ.store.stats
         if _is_terminal_case(self, other):
+            stats.terminal_cases += 1
             result = _terminal_value(self, other, oper, self.is_fully_reduced)
-            _log_apply(self, other, oper, result, True)
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _log_apply(self, other, oper, result, True)
+            return result
+
+        if _is_constant(self) or _is_constant(other):
+            stats.constant_cases += 1
+            return _apply_to_constant(self, other, oper)
+
+        if _is_additive(oper) and (self.weight != 0 or other.weight != 0):
+            offset = _aggregate_weights(self.weight, other.weight, oper)
+            self_succ_edge = Edge(weight=0, succ=self.succ,
+                                  is_fully_reduced=self.is_fully_reduced)
+            other_succ_edge = Edge(weight=0, succ=other.succ,
+                                   is_fully_reduced=other.is_fully_reduced)
+            return self_succ_edge._compute_apply(other_succ_edge, oper) + offset
+
+        key = (oper, self.weight, self.succ.id, other.weight, other.succ.id)
+        computed_table = self.succ.store.computed_table
+        result = computed_table.lookup(key)
+        if result is not None:
             return result
 
+        stats.recursive_cases += 1
         level = max(self.succ.level, other.succ.level)
         self_children = _align_levels(self, other)
         other_children = _align_levels(other, self)
@@ -220,14 +577,10 @@ class Edge(EqualityMixin):
         assert len(self_children) == len(other_children)
 
         children = [oper(sc, oc) for sc, oc in zip(self_children, other_children)]
-        result_weight = min([child.weight for child in children])
-        children = tuple([child-result_weight for child in children])
-        result_succ = Node(level, children, self.is_fully_reduced)
-
-        if self.is_fully_reduced:
-            result_succ = _perform_shannon_reduction(result_succ)
-        result = Edge(weight=result_weight, succ=result_succ, is_fully_reduced=self.is_fully_reduced)
-        _log_apply(self, other, oper, result, False)
+        result = _make_node_evmdd(level, children, self.is_fully_reduced)
+        computed_table.insert(key, result)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _log_apply(self, other, oper, result, False)
         return result
 
     def __add__(self, other):
@@ -247,17 +600,30 @@ class Edge(EqualityMixin):
                         is_fully_reduced=self.is_fully_reduced)
 
     def __mul__(self, other):
-        return self._apply(other, Edge.__mul__)
+        if isinstance(other, type(self)):
+            return self._apply(other, Edge.__mul__)
+        else:
+            assert isinstance(other, Integral)
+            return _scale(self, other)
 
     def __neg__(self):
-        return _make_const_evmdd(0, self.is_fully_reduced) - self
+        return _make_const_evmdd(0, self.is_fully_reduced, self.succ.store) - self
 
     def __pow__(self, other):
         if not isinstance(other, Integral) or other < 0:
             raise ValueError("EVMDDs may only be raised to a nonnegative integral power.")
-        if other == 0:
-            return _make_const_evmdd(1, self.is_fully_reduced)
-        return self * (self ** (other-1))
+        result = _make_const_evmdd(1, self.is_fully_reduced, self.succ.store)
+        base = self
+        while other:
+            if other & 1:
+                result = result * base
+            other >>= 1
+            if other:
+                base = base * base
+        return result
+
+    def __hash__(self):
+        return hash(self.id)
 
     def __str__(self):
         return 'Edge(%s,%s)' % (self.weight, self.succ)
@@ -267,8 +633,7 @@ class Edge(EqualityMixin):
                 (self.weight, repr(self.succ), self.is_fully_reduced))
 
 
-@memoize
-class Node(EqualityMixin):
+class Node(object):
     """A node in an |EVMDD| specifying level and children.
 
     The `level` of a node `n` specifies how far from the sink node `n` is
@@ -293,16 +658,40 @@ class Node(EqualityMixin):
 
     Like `Edges`, `Nodes` keep track of whether they belong to a fully reduced
     or a quasi-reduced |EVMDD| via the flag `is_fully_reduced`.
+
+    Like `Edges`, `Nodes` are hash-consed on their level, the IDs of their
+    children, and their reduction type, carry a unique integer `id`, and are
+    compared by identity and hashed in constant time.
+
+    Each node belongs to the `NodeStore` given by its attribute `store`. Inner
+    nodes inherit the store of their children. For the sink node, the store
+    can be passed explicitly and defaults to a shared default store.
     """
 
-    def __init__(self, level, children, is_fully_reduced=_DEFAULT_IS_FULLY_REDUCED):
-        """Initialize an |EVMDD| node with level and children."""
-        self.level = level
-        self.children = tuple(children)
-        self.is_fully_reduced = is_fully_reduced
-        if level == 0:
-            assert len(children) == 0
-        assert all([child.is_fully_reduced == is_fully_reduced for child in children])
+    __slots__ = ('level', 'children', 'is_fully_reduced', 'store', 'id', '__weakref__')
+
+    def __new__(cls, level, children, is_fully_reduced=_DEFAULT_IS_FULLY_REDUCED,
+                store=None):
+        """Get the unique |EVMDD| node with given level and children."""
+        children = tuple(children)
+        if children:
+            store = children[0].succ.store
+        elif store is None:
+            store = _DEFAULT_STORE
+        key = _node_key(level, children, is_fully_reduced)
+        node = store.nodes.lookup(key)
+        if node is None:
+            if level == 0:
+                assert len(children) == 0
+            assert all([child.is_fully_reduced == is_fully_reduced for child in children])
+            assert all([child.succ.store is store for child in children])
+            node = super(Node, cls).__new__(cls)
+            node.level = level
+            node.children = children
+            node.is_fully_reduced = is_fully_reduced
+            node.store = store
+            node = store.nodes.insert(key, node)
+        return node
 
     def is_sink_node(self):
         """Test if this is the sink node."""
@@ -310,10 +699,42 @@ class Node(EqualityMixin):
 
     def nodes(self):
         """Get all nodes in the (sub-) |EVMDD| rooted at this node."""
-        result = set([self])
-        for child in self.children:
-            result.update(child.nodes())
-        return result
+        return set(self.iter_nodes())
+
+    def iter_nodes(self, order=PREORDER):
+        """Iterate over all nodes in the (sub-) |EVMDD| rooted at this node.
+
+        The traversal uses an explicit stack (or queue) and a set of visited
+        node IDs, such that each node is reported exactly once, in time linear
+        in the size of the |EVMDD|, and independently of the recursion limit.
+
+        Args:
+            `order` (string): the traversal order, one of ``'preorder'``
+            (depth-first, parents before children), ``'postorder'``
+            (depth-first, children before parents), or ``'levelorder'``
+            (top-down, by decreasing level).
+
+        Returns:
+            an iterator over the reachable nodes, starting with or ending in
+            this node.
+
+        Examples:
+            >>> sink = _make_sink_node()
+            >>> low = Node(level=1, children=[Edge(0, sink), Edge(1, sink)])
+            >>> root = Node(level=2, children=[Edge(0, low), Edge(2, low)])
+            >>> [node.level for node in root.iter_nodes('preorder')]
+            [2, 1, 0]
+            >>> [node.level for node in root.iter_nodes('postorder')]
+            [0, 1, 2]
+            >>> [node.level for node in root.iter_nodes('levelorder')]
+            [2, 1, 0]
+        """
+        if order not in _TRAVERSALS:
+            raise ValueError('Unknown traversal order: %s' % order)
+        return _TRAVERSALS[order](self)
+
+    def __hash__(self):
+        return hash(self.id)
 
     def __str__(self):
         if self.is_sink_node():
@@ -343,15 +764,21 @@ class EvmddManager(object):
     The |EVMDDs| generated and managed by this manager can be either fully
     reduced or quasi-reduced. They will be fully reduced iff the flag
     `fully_reduced` is set to true (default).
+
+    The variable order can be changed in place by reordering (see `sift`).
+    Every change increments the attribute `order_version`, which allows
+    clients caching level-based information to detect it.
     """
 
     def __init__(self, var_names, var_domains, fully_reduced=_DEFAULT_IS_FULLY_REDUCED):
         """Initialize an `EvmddManager` with variable names and domain sizes.
         """
         assert len(var_names) == len(var_domains)
-        self._var_names = var_names
-        self._var_domains = var_domains
+        self._var_names = list(var_names)
+        self._var_domains = list(var_domains)
         self._fully_reduced = fully_reduced
+        self._store = NodeStore()
+        self.order_version = 0
 
     def _level_to_domain_size(self, level):
         """Get the domain size of the variable associated with nodes on a given `level`.
@@ -401,7 +828,7 @@ class EvmddManager(object):
         Returns:
             Edge: the |EVMDD| representing the given number.
         """
-        return _make_const_evmdd(number, self._fully_reduced)
+        return _make_const_evmdd(number, self._fully_reduced, self._store)
 
     def _make_var_evmdd_for_level(self, level):
         """Construct an |EVMDD| representing a given variable.
@@ -410,14 +837,14 @@ class EvmddManager(object):
         test node branching on the variable of the requested level. The test
         node has one outgoing edge for each value `d` in the domain of the tested
         variable. The weight of the edge for value `d` has weight `d`. All edges
-        lead to the unique sink node.
+        lead to the unique sink node. In the fully reduced case, a variable
+        with a single value is represented by the constant zero.
         """
-        sink = _make_sink_node(self._fully_reduced)
+        sink = _make_sink_node(self._fully_reduced, self._store)
         domain_size = self._level_to_domain_size(level)
         children = [Edge(weight=d, succ=sink,
                          is_fully_reduced=self._fully_reduced) for d in range(domain_size)]
-        var_node = Node(level=level, children=children, is_fully_reduced=self._fully_reduced)
-        return Edge(weight=0, succ=var_node, is_fully_reduced=self._fully_reduced)
+        return _make_node_evmdd(level, children, self._fully_reduced)
 
     def make_var_evmdd_for_var(self, var_name):
         """Construct an |EVMDD| representing a given variable.
@@ -434,6 +861,388 @@ class EvmddManager(object):
         """
         return self._make_var_evmdd_for_level(self._var_name_to_level(var_name))
 
+    def configure_computed_table(self, capacity, policy=ComputedTable.LRU):
+        """Replace the computed table caching results of arithmetic operations.
+
+        Args:
+            `capacity` (int): the maximal number of cached results, or `None`
+            for an unbounded table.
+
+            `policy` (string): the eviction policy, either ``'lru'`` or
+            ``'direct-mapped'`` (see `ComputedTable`).
+
+        Note:
+            Every manager has its own computed table.
+        """
+        self._store.computed_table = ComputedTable(capacity, policy)
+
+    def flush_computed_table(self):
+        """Remove all cached results of arithmetic operations."""
+        self._store.flush_caches()
+
+    def collect_garbage(self):
+        """Reclaim nodes and edges no longer used by any |EVMDD|.
+
+        Nodes and edges of this manager are only weakly referenced from its
+        unique tables and are reclaimed as soon as no |EVMDD| referenced by
+        client code uses them any more. The remaining strong references are
+        held by the computed table. This method flushes the computed table and
+        thereby releases all nodes that are only kept alive by cached results.
+
+        Returns:
+            `int`: the number of nodes that were reclaimed.
+        """
+        num_nodes_before = len(self._store.nodes)
+        self.flush_computed_table()
+        return num_nodes_before - len(self._store.nodes)
+
+    def restrict(self, evmdd, partial_valuation):
+        """Fix the values of some variables of an |EVMDD| of this manager.
+
+        Args:
+            `evmdd` (Edge): an |EVMDD|.
+
+            `partial_valuation` (dict from strings to ints): the values of the
+            variables to fix.
+
+        Returns:
+            `Edge`: the |EVMDD| over the remaining variables. See
+            `restrict.restrict`.
+
+        Example:
+            >>> manager = EvmddManager(['A', 'B'], [2, 3])
+            >>> a = manager.make_var_evmdd_for_var('A')
+            >>> b = manager.make_var_evmdd_for_var('B')
+            >>> manager.restrict(a * b + a, {'A': 1}) is b + 1
+            True
+        """
+        from .restrict import restrict
+        return restrict(evmdd, partial_valuation, self)
+
+    def restrict_many(self, evmdd, partial_valuations):
+        """Restrict an |EVMDD| of this manager to several partial valuations,
+        sharing one cache between them. See `restrict.restrict_many`.
+        """
+        from .restrict import restrict_many
+        return restrict_many(evmdd, partial_valuations, self)
+
+    def to_fully_reduced(self, evmdd):
+        """Convert an |EVMDD| of this manager to a fully reduced |EVMDD|.
+
+        The result is stored alongside the |EVMDDs| of this manager, even if
+        this manager constructs quasi-reduced |EVMDDs|. See
+        `reduction.to_fully_reduced`.
+        """
+        from .reduction import to_fully_reduced
+        return to_fully_reduced(evmdd, self)
+
+    def to_quasi_reduced(self, evmdd):
+        """Convert an |EVMDD| of this manager to a quasi-reduced |EVMDD|.
+
+        The result is stored alongside the |EVMDDs| of this manager, even if
+        this manager constructs fully reduced |EVMDDs|. See
+        `reduction.to_quasi_reduced`.
+
+        Example:
+            >>> manager = EvmddManager(['A', 'B'], [2, 3])
+            >>> a = manager.make_var_evmdd_for_var('A')
+            >>> quasi = manager.to_quasi_reduced(a + 1)
+            >>> [child.succ.level for child in quasi.succ.children]
+            [1, 1]
+            >>> manager.to_quasi_reduced(a + 1) is quasi
+            True
+            >>> manager.to_fully_reduced(quasi) is a + 1
+            True
+        """
+        from .reduction import to_quasi_reduced
+        return to_quasi_reduced(evmdd, self)
+
+    def swap_adjacent_levels(self, level):
+        """Swap the variables on levels `level` and `level+1` in place.
+
+        All live |EVMDDs| of this manager are restructured and keep
+        representing the same functions. See `reorder.swap_adjacent_levels`.
+        """
+        from .reorder import swap_adjacent_levels
+        swap_adjacent_levels(self, level)
+
+    def sift(self, max_growth=1.2):
+        """Improve the variable order of this manager by sifting in place.
+
+        See `reorder.sift`.
+
+        Returns:
+            `int`: the number of live nodes after sifting.
+
+        Example:
+            >>> manager = EvmddManager(['A', 'C', 'B', 'D'], [2, 2, 2, 2])
+            >>> a, b, c, d = [manager.make_var_evmdd_for_var(var) for var in 'ABCD']
+            >>> evmdd = a * b + c * d
+            >>> evmdd.num_nodes()
+            7
+            >>> _ = manager.sift()
+            >>> evmdd.num_nodes()
+            5
+            >>> manager._var_names
+            ['A', 'B', 'C', 'D']
+            >>> evaluate(evmdd, {'A': 1, 'B': 1, 'C': 0, 'D': 1}, manager)
+            1
+        """
+        from .reorder import sift
+        return sift(self, max_growth)
+
+    def enable_auto_reordering(self, threshold=4096, max_growth=1.2):
+        """Sift automatically whenever the number of live nodes gets too large.
+
+        After each arithmetic operation on |EVMDDs| of this manager, if more
+        than `threshold` nodes are live, the variable order is improved by
+        sifting, and the threshold is raised to twice the number of live
+        nodes after sifting, unless that is smaller than `threshold`. No
+        reordering takes place while quasi-reduced |EVMDDs| of this manager
+        (see `to_quasi_reduced`) are live.
+
+        Automatic reordering must not be enabled while several threads
+        operate on |EVMDDs| of this manager.
+
+        Args:
+            `threshold` (int): the number of live nodes triggering reordering.
+
+            `max_growth` (float): see `sift`.
+        """
+        from .reorder import _check_fully_reduced, _has_quasi_reduced_nodes, sift
+        _check_fully_reduced(self)
+        store = self._store
+
+        def reorder():
+            store.reorder_threshold = None
+            try:
+                if _has_quasi_reduced_nodes(store):
+                    _LOGGER.debug('not reordering while quasi-reduced EVMDDs are live')
+                    return
+                num_nodes = sift(self, max_growth)
+            finally:
+                store.reorder_threshold = max(threshold, 2 * len(store.nodes))
+            _LOGGER.debug('reordered to %d nodes: %s' % (num_nodes, self._var_names))
+
+        store.reorder = reorder
+        store.reorder_threshold = threshold
+
+    def disable_auto_reordering(self):
+        """Stop reordering automatically (see `enable_auto_reordering`)."""
+        self._store.reorder_threshold = None
+        self._store.reorder = None
+
+    def memory_usage(self):
+        """Estimate the memory footprint of the |EVMDDs| of this manager.
+
+        Returns:
+            `dict`: the numbers of live ``'nodes'`` and ``'edges'``, the
+            number of ``'computed_table_entries'``, and an estimate of the
+            ``'bytes'`` occupied by the live nodes and edges.
+        """
+        nodes = self._store.nodes.values()
+        edges = self._store.edges.values()
+        num_bytes = 0
+        for obj in nodes + edges:
+            num_bytes += getsizeof(obj)
+        for node in nodes:
+            num_bytes += getsizeof(node.children)
+        return {
+            'nodes': len(nodes),
+            'edges': len(edges),
+            'computed_table_entries': len(self._store.computed_table),
+            'bytes': num_bytes,
+        }
+
+    def stats(self):
+        """Get statistics about the work done on the |EVMDDs| of this manager.
+
+        Returns:
+            `dict`: the numbers of applications of each arithmetic operator
+            (``'apply_calls'``, a dict keyed by ``'+'``, ``'-'``, and
+            ``'*'``), of terminal, constant-operand and recursive cases
+            (``'terminal_cases'``, ``'constant_cases'``,
+            ``'recursive_cases'``), of hits and misses in the unique tables
+            for nodes and edges (``'unique_table_hits'``,
+            ``'unique_table_misses'``) and in the computed table
+            (``'computed_table_hits'``, ``'computed_table_misses'``), the
+            ``'peak_recursion_depth'`` of applications, and the cumulative
+            ``'apply_time'`` in seconds.
+
+        Example:
+            >>> manager = EvmddManager(['A', 'B'], [2, 2])
+            >>> a = manager.make_var_evmdd_for_var('A')
+            >>> b = manager.make_var_evmdd_for_var('B')
+            >>> manager.reset_stats()
+            >>> _ = a * b
+            >>> stats = manager.stats()
+            >>> stats['apply_calls']
+            {'+': 0, '-': 0, '*': 3}
+            >>> stats['constant_cases'], stats['recursive_cases']
+            (2, 1)
+            >>> stats['computed_table_hits'], stats['computed_table_misses']
+            (0, 1)
+            >>> _ = a * b
+            >>> manager.stats()['computed_table_hits']
+            1
+            >>> manager.reset_stats()
+            >>> _ = (a + 1) + (b + 2)
+            >>> stats = manager.stats()
+            >>> stats['apply_calls']['+'] == (stats['terminal_cases'] +
+            ...     stats['constant_cases'] + stats['recursive_cases'] +
+            ...     stats['computed_table_hits'])
+            True
+        """
+        store = self._store
+        apply_stats = store.stats
+        unique_tables = (store.nodes, store.edges)
+        return {
+            'apply_calls': {
+                symbol: apply_stats.apply_calls[name] for symbol, name in
+                (('+', '__add__'), ('-', '__sub__'), ('*', '__mul__'))
+            },
+            'terminal_cases': apply_stats.terminal_cases,
+            'constant_cases': apply_stats.constant_cases,
+            'recursive_cases': apply_stats.recursive_cases,
+            'unique_table_hits': sum([table.hits for table in unique_tables]),
+            'unique_table_misses': sum([table.misses for table in unique_tables]),
+            'computed_table_hits': store.computed_table.hits,
+            'computed_table_misses': store.computed_table.misses,
+            'peak_recursion_depth': apply_stats.peak_depth,
+            'apply_time': apply_stats.apply_time,
+        }
+
+    def reset_stats(self):
+        """Reset all statistics reported by `stats` to zero."""
+        store = self._store
+        store.stats.reset()
+        for table in (store.nodes, store.edges, store.computed_table):
+            table.reset_statistics()
+
+    def compact(self, evmdd):
+        """Convert an |EVMDD| of this manager to compact, array-backed form.
+
+        Args:
+            `evmdd` (Edge): an |EVMDD|.
+
+        Returns:
+            `CompactEvmdd`: the equivalent compact |EVMDD|, which supports
+            evaluation and arithmetic operators like `evmdd` itself.
+
+        Example:
+            >>> manager = EvmddManager(['A', 'B'], [2, 3])
+            >>> a = manager.make_var_evmdd_for_var('A')
+            >>> b = manager.make_var_evmdd_for_var('B')
+            >>> compact = manager.compact(a * b + 1)
+            >>> compact.num_nodes(), compact.num_edges()
+            (3, 6)
+            >>> evaluate(compact, {'A': 1, 'B': 2}, manager)
+            3
+            >>> evaluate(compact + b, {'A': 1, 'B': 2}, manager)
+            5
+            >>> manager.expand(compact) is a * b + 1
+            True
+        """
+        from .compact import CompactEvmdd
+        return CompactEvmdd.from_evmdd(evmdd, self)
+
+    def compile(self, evmdd):
+        """Compile an |EVMDD| of this manager into a fast evaluation function.
+
+        Args:
+            `evmdd` (Edge or CompactEvmdd): an |EVMDD|.
+
+        Returns:
+            `CompiledEvmdd`: a callable mapping a valuation, given either as a
+            dict from variable names to values or as a sequence of values in
+            the variable order of this manager, to the value of `evmdd`.
+
+        Example:
+            >>> manager = EvmddManager(['A', 'B'], [2, 3])
+            >>> a = manager.make_var_evmdd_for_var('A')
+            >>> b = manager.make_var_evmdd_for_var('B')
+            >>> fn = manager.compile(a * b + 1)
+            >>> fn({'A': 1, 'B': 2}), fn((1, 2)), fn([0, 2])
+            (3, 3, 1)
+        """
+        from .compact import CompactEvmdd, CompiledEvmdd
+        if not isinstance(evmdd, CompactEvmdd):
+            evmdd = CompactEvmdd.from_evmdd(evmdd, self)
+        return CompiledEvmdd(evmdd, self)
+
+    def to_array(self, evmdd):
+        """Compute the table of all values of an |EVMDD| of this manager.
+
+        Requires NumPy. See `dense.to_array`.
+
+        Returns:
+            `numpy.ndarray`: the values of `evmdd`, with one axis per
+            variable, in the variable order of this manager.
+        """
+        from .dense import to_array
+        return to_array(evmdd, self)
+
+    def from_array(self, array):
+        """Build the |EVMDD| of this manager with given table of values.
+
+        Requires NumPy. See `dense.from_array`.
+
+        Args:
+            `array` (array of ints): the table of values, with one axis per
+            variable, in the variable order of this manager.
+
+        Returns:
+            `Edge`: the |EVMDD| representing `array`.
+
+        Example:
+            >>> manager = EvmddManager(['A', 'B'], [2, 3])
+            >>> a = manager.make_var_evmdd_for_var('A')
+            >>> b = manager.make_var_evmdd_for_var('B')
+            >>> table = manager.to_array(a * b + 1)
+            >>> table.tolist()
+            [[1, 1, 1], [1, 2, 3]]
+            >>> manager.from_array(table) is a * b + 1
+            True
+        """
+        from .dense import from_array
+        return from_array(array, self)
+
+    def from_function(self, function):
+        """Build the |EVMDD| of this manager for a function given as a Python
+        callable on valuations (dicts from variable names to values).
+
+        See `builder.from_function`.
+
+        Example:
+            >>> manager = EvmddManager(['A', 'B'], [2, 3])
+            >>> a = manager.make_var_evmdd_for_var('A')
+            >>> b = manager.make_var_evmdd_for_var('B')
+            >>> manager.from_function(lambda s: s['A'] * s['B'] ** 3) is a * b ** 3
+            True
+        """
+        from .builder import from_function
+        return from_function(function, self)
+
+    def from_values(self, values):
+        """Build the |EVMDD| of this manager with given values for all
+        valuations, in lexicographic order with respect to the variable order.
+
+        The values are consumed in a single pass. See `builder.from_values`.
+        """
+        from .builder import from_values
+        return from_values(values, self)
+
+    def expand(self, compact_evmdd):
+        """Convert a compact |EVMDD| back into `Nodes` and `Edges` of this manager.
+
+        Args:
+            `compact_evmdd` (CompactEvmdd): a compact |EVMDD|.
+
+        Returns:
+            `Edge`: the equivalent |EVMDD|.
+        """
+        return compact_evmdd.to_evmdd(self)
+
 
 def evaluate(evmdd, valuation, manager):
     """Evaluate an |EVMDD| `evmdd` for given valuation `valuation` and
@@ -449,7 +1258,7 @@ def evaluate(evmdd, valuation, manager):
     `valuation`. Then, the corresponding edge is traversed.
 
     Args:
-        `evmdd` (Edge): an |EVMDD|.
+        `evmdd` (Edge): an |EVMDD|, or a `CompactEvmdd`.
 
         `valuation` (dict[string->int]): a variable-value mapping to be evaluated.
 
@@ -482,6 +1291,8 @@ def evaluate(evmdd, valuation, manager):
         >>> evaluate(evmdd, s, manager)
         5
     """
+    if not isinstance(evmdd, Edge):
+        return evmdd.evaluate(valuation, manager)
     current_edge = evmdd
     current_node = current_edge.succ
     result = current_edge.weight
@@ -65,10 +65,10 @@ class GraphvizWriter(object):
                 (weight_node_name, succ_var_node_name))
 
     def _var_node_name(self, node):
-        return self._var_node_name_tmpl % (self._index[node], node.level)
+        return self._var_node_name_tmpl % (self._index[node.id], node.level)
 
     def _weight_node_name(self, node, domain_idx):
-        return self._weight_node_name_tmpl % (self._index[node], node.level, domain_idx)
+        return self._weight_node_name_tmpl % (self._index[node.id], node.level, domain_idx)
 
     def _root_edge_to_gvz(self, evmdd):
         var_node_name = 'dummyNode'
@@ -110,11 +110,11 @@ class GraphvizWriter(object):
         Returns:
             `string`: an encoding of the |EVMDD| in Graphviz/DOT format.
         """
-        nodes = evmdd.nodes()
+        nodes = list(evmdd.iter_nodes('levelorder'))
+        nodes.reverse()
         sorting_fn = lambda node: node.level
-        nodes = sorted(nodes, key=sorting_fn)
 
-        self._index = {node: idx for idx, node in enumerate(nodes)}
+        self._index = {node.id: idx for idx, node in enumerate(nodes)}
         lines = ['digraph G {']
         lines.extend(self._root_edge_to_gvz(evmdd))
         for node in nodes:
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of the EVMDD Library for Python (pyevmdd).
+# Copyright (C) 2016 Robert Mattmüller
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Incremental evaluation of |EVMDDs| for sequences of similar valuations.
+"""
+
+class IncrementalEvaluator(object):
+    """An evaluator of one |EVMDD| for a valuation that changes over time.
+
+    The evaluator keeps the path through the |EVMDD| for its current
+    valuation, together with the sum of the edge weights up to each node on
+    that path. When the values of some variables change (see `update`), the
+    part of the path above the highest level of a changed variable is still
+    valid, and only the remaining part is walked again. This is much cheaper
+    than evaluating from scratch if mostly variables on low levels change.
+
+    If the variable order of the manager changes in place (see
+    `EvmddManager.sift`), the path is no longer valid, since its nodes have
+    been restructured. The evaluator detects this through the
+    `order_version` of the manager and walks the whole path again on the
+    next update.
+
+    Args:
+        `evmdd` (Edge): an |EVMDD|.
+
+        `manager` (EvmddManager): the manager of `evmdd`.
+
+        `valuation` (dict from strings to ints): the initial valuation.
+
+    Example:
+        >>> from .parser import term_to_evmdd
+        >>> evmdd, manager = term_to_evmdd('A*B**2 + C + 2',
+        ...     var_names=['A', 'B', 'C'], var_domains={'A': 2, 'B': 3, 'C': 2})
+        >>> evaluator = IncrementalEvaluator(evmdd, manager, {'A': 1, 'B': 2, 'C': 0})
+        >>> evaluator.value
+        6
+        >>> evaluator.update({'C': 1})
+        7
+        >>> evaluator.update({'A': 0, 'B': 1})
+        3
+        >>> evaluator.valuation == {'A': 0, 'B': 1, 'C': 1}
+        True
+    """
+
+    def __init__(self, evmdd, manager, valuation):
+        self._manager = manager
+        self._order_version = manager.order_version
+        self.valuation = dict(valuation)
+        # The nodes on the current path, ending in the sink node, and the sum
+        # of the weights of the edges leading to each of them.
+        self._nodes = [evmdd.succ]
+        self._sums = [evmdd.weight]
+        self._walk()
+
+    @property
+    def value(self):
+        """The value of the |EVMDD| for the current valuation."""
+        return self._sums[-1]
+
+    def _walk(self):
+        """Extend the path from its last node down to the sink node."""
+        manager = self._manager
+        valuation = self.valuation
+        nodes = self._nodes
+        sums = self._sums
+        node = nodes[-1]
+        total = sums[-1]
+        while not node.is_sink_node():
+            var_value = valuation[manager._level_to_var_name(node.level)]
+            assert 0 <= var_value < len(node.children)
+            child = node.children[var_value]
+            node = child.succ
+            total += child.weight
+            nodes.append(node)
+            sums.append(total)
+
+    def update(self, changes):
+        """Change the values of some variables and re-evaluate.
+
+        Args:
+            `changes` (dict from strings to ints): the new values of the
+            changed variables.
+
+        Returns:
+            the value of the |EVMDD| for the updated valuation.
+        """
+        manager = self._manager
+        top_level = 0
+        for var_name, value in changes.items():
+            if self.valuation.get(var_name) != value:
+                top_level = max(top_level, manager._var_name_to_level(var_name))
+            self.valuation[var_name] = value
+        nodes = self._nodes
+        if self._order_version != manager.order_version:
+            # The root keeps its identity, but all other nodes may have moved.
+            self._order_version = manager.order_version
+            keep = 1
+        else:
+            # Keep the longest prefix of the path above the changed levels.
+            keep = len(nodes)
+            while keep > 1 and nodes[keep-2].level <= top_level:
+                keep -= 1
+        if keep < len(nodes):
+            del nodes[keep:]
+            del self._sums[keep:]
+            self._walk()
+        return self.value
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of the EVMDD Library for Python (pyevmdd).
+# Copyright (C) 2016 Robert Mattmüller
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Static variable-order heuristics computed from function terms.
+
+All heuristics are based on the *interaction groups* of a function term: the
+sets of variables occurring together in one summand of the top-level sum of
+the term. For a polynomial in normal form, these are the variable sets of its
+monomials. Variables that interact should be close to each other in the
+variable order, such that the |EVMDD| does not have to remember the values of
+many variables across many levels.
+
+The following heuristics are available:
+
+* ``'lexicographic'``: variables sorted by name.
+* ``'interaction'``: a greedy ordering that repeatedly picks the variable
+  sharing the most interaction groups with the variables placed so far.
+* ``'force'``: the FORCE heuristic [Aloul et al., 2003], which repeatedly
+  moves each variable to the average center of gravity of its interaction
+  groups, starting from the interaction ordering.
+* ``'domain'``: the interaction ordering, stably sorted by increasing domain
+  size. Since the number of nodes on a level is bounded by the product of the
+  domain sizes above it, variables with small domains are placed on top.
+"""
+
+from .parser import _flatten_sum, collect_variables
+
+LEXICOGRAPHIC = 'lexicographic'
+INTERACTION = 'interaction'
+FORCE = 'force'
+DOMAIN = 'domain'
+
+_FORCE_MAX_ITERATIONS = 50
+
+def interaction_groups(function_term_ast):
+    """Determine the interaction groups of a function term.
+
+    Args:
+        `function_term_ast`: a term represented as an abstract syntax tree,
+        as returned by `read_function_term`.
+
+    Returns:
+        `list[frozenset[string]]`: the non-empty sets of variables of the
+        summands of the top-level sum of the term.
+
+    Example:
+        >>> from .parser import read_function_term
+        >>> term = read_function_term('A*B - C*(D + A) + 3')
+        >>> [sorted(group) for group in interaction_groups(term)]
+        [['A', 'B'], ['A', 'C', 'D']]
+    """
+    groups = []
+    for _, summand in _flatten_sum(function_term_ast.body):
+        group = frozenset(collect_variables(summand))
+        if group:
+            groups.append(group)
+    return groups
+
+def _span(order, groups):
+    """Get the total span of all interaction groups in `order`."""
+    positions = {var: pos for pos, var in enumerate(order)}
+    return sum([max([positions[var] for var in group]) -
+                min([positions[var] for var in group]) for group in groups])
+
+def _interaction_order(var_names, groups):
+    weights = {var: {} for var in var_names}
+    for group in groups:
+        for var in group:
+            for other in group:
+                if var != other:
+                    weights[var][other] = weights[var].get(other, 0) + 1
+    degrees = {var: sum(weights[var].values()) for var in var_names}
+    order = []
+    scores = {var: 0 for var in var_names}
+    while scores:
+        var = min(scores, key=lambda var: (-scores[var], -degrees[var], var))
+        del scores[var]
+        order.append(var)
+        for other, weight in weights[var].items():
+            if other in scores:
+                scores[other] += weight
+    return order
+
+def _force_order(var_names, groups):
+    order = _interaction_order(var_names, groups)
+    best_order, best_span = order, _span(order, groups)
+    groups_of = {var: [] for var in var_names}
+    for group in groups:
+        for var in group:
+            groups_of[var].append(group)
+    for _ in range(_FORCE_MAX_ITERATIONS):
+        positions = {var: pos for pos, var in enumerate(order)}
+        centers = {group: sum([positions[var] for var in group]) / len(group)
+                   for group in groups}
+        targets = {}
+        for var in order:
+            if groups_of[var]:
+                targets[var] = (sum([centers[group] for group in groups_of[var]]) /
+                                len(groups_of[var]))
+            else:
+                targets[var] = positions[var]
+        order = sorted(order, key=lambda var: (targets[var], positions[var]))
+        span = _span(order, groups)
+        if span >= best_span:
+            break
+        best_order, best_span = order, span
+    return best_order
+
+def _domain_order(var_names, groups, var_domains):
+    return sorted(_interaction_order(var_names, groups),
+                  key=lambda var: var_domains[var])
+
+ORDERINGS = (LEXICOGRAPHIC, INTERACTION, FORCE, DOMAIN)
+
+def order_variables(function_term_ast, var_names, var_domains, ordering):
+    """Order the variables of a function term with a static heuristic.
+
+    Args:
+        `function_term_ast`: a term represented as an abstract syntax tree,
+        as returned by `read_function_term`.
+
+        `var_names` (list of strings): the variables to order, a superset of
+        the variables of the term.
+
+        `var_domains` (dict from strings to ints): the domain sizes of the
+        variables.
+
+        `ordering` (string): the name of the heuristic, one of
+        ``'lexicographic'``, ``'interaction'``, ``'force'``, and
+        ``'domain'`` (see module documentation).
+
+    Returns:
+        `list[string]`: the variable names in the computed order.
+
+    Example:
+        >>> from .parser import read_function_term
+        >>> term = read_function_term('A*D + B*E + C*F')
+        >>> var_names = ['A', 'B', 'C', 'D', 'E', 'F']
+        >>> var_domains = {var: 2 for var in var_names}
+        >>> var_domains['E'] = 3
+        >>> for ordering in ORDERINGS:
+        ...     print(order_variables(term, var_names, var_domains, ordering))
+        ['A', 'B', 'C', 'D', 'E', 'F']
+        ['A', 'D', 'B', 'E', 'C', 'F']
+        ['A', 'D', 'B', 'E', 'C', 'F']
+        ['A', 'D', 'B', 'C', 'F', 'E']
+    """
+    groups = interaction_groups(function_term_ast)
+    if ordering == LEXICOGRAPHIC:
+        return sorted(var_names)
+    elif ordering == INTERACTION:
+        return _interaction_order(var_names, groups)
+    elif ordering == FORCE:
+        return _force_order(var_names, groups)
+    elif ordering == DOMAIN:
+        return _domain_order(var_names, groups, var_domains)
+    raise ValueError('Unknown variable ordering: %s' % ordering)
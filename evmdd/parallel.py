@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of the EVMDD Library for Python (pyevmdd).
+# Copyright (C) 2016 Robert Mattmüller
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Parallel construction of many |EVMDDs| over the same variables.
+
+Terms are translated in worker processes, each with its own manager for the
+common variables. Every result is sent back to the parent process in the
+flat encoding of `CompactEvmdd`, i.e., as a handful of arrays, which are
+cheap to pickle. The parent expands all results into one manager, whose
+unique tables merge sub-|EVMDDs| shared between results. Results with weights
+that do not fit into the 64-bit arrays of `CompactEvmdd` are built again in
+the parent process.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from .compact import CompactEvmdd
+from .evmdd import EvmddManager
+from .parser import read_function_term, _translate_term
+
+# The manager of a worker process, shared by all terms built in it.
+_worker_manager = None
+_worker_method = None
+
+def _init_worker(var_names, var_domains, fully_reduced, method):
+    global _worker_manager, _worker_method
+    _worker_manager = EvmddManager(var_names, var_domains, fully_reduced)
+    _worker_method = method
+
+def _build_flat(function_term):
+    """Build the |EVMDD| for `function_term` in a worker process and return
+    the arrays and root of its compact form, or `None` if its weights do not
+    fit into the arrays."""
+    function_term_ast = read_function_term(function_term)
+    evmdd = _translate_term(function_term_ast, _worker_manager, _worker_method)
+    try:
+        compact = CompactEvmdd.from_evmdd(evmdd)
+    except OverflowError:
+        return None
+    return (compact.levels, compact.child_offsets, compact.child_weights,
+            compact.child_succs, compact.root_weight, compact.root)
+
+def build_many(terms, var_names, var_domains, workers=None, **kwargs):
+    r"""Translate many function terms over the same variables to |EVMDDs|.
+
+    Args:
+        `terms` (list of strings): the function terms (see `term_to_evmdd`).
+
+        `var_names` (list of strings): the variable names in the desired
+        ordering, covering the variables of all terms.
+
+        `var_domains` (dict from strings to ints): the domain sizes of the
+        variables.
+
+        `workers` (int, optional): the number of worker processes. Defaults
+        to the number of CPUs. With a single worker, the terms are built in
+        the calling process.
+
+        \*\*\ `kwargs`: optionally, the flag `fully_reduced` and the
+        construction `method`, as for `term_to_evmdd`.
+
+    Returns:
+        a tuple consisting of the list of |EVMDDs| for `terms`, in the same
+        order, and their common manager.
+
+    Example:
+        >>> from .evmdd import evaluate
+        >>> terms = ['A*B + C', 'A*B + 2*C', 'B - A']
+        >>> evmdds, manager = build_many(terms, ['A', 'B', 'C'],
+        ...                              {'A': 2, 'B': 3, 'C': 2}, workers=2)
+        >>> [evaluate(evmdd, {'A': 1, 'B': 2, 'C': 1}, manager) for evmdd in evmdds]
+        [3, 4, 1]
+        >>> a, b = manager.make_var_evmdd_for_var('A'), manager.make_var_evmdd_for_var('B')
+        >>> evmdds[2] is b - a
+        True
+        >>> evmdds, manager = build_many(['A**40', 'A'], ['A'], {'A': 4}, workers=2)
+        >>> evaluate(evmdds[0], {'A': 3}, manager) == 3**40 > 2**63
+        True
+    """
+    fully_reduced = kwargs.get('fully_reduced', True)
+    method = kwargs.get('method', 'apply')
+    var_names = list(var_names)
+    var_domains = [var_domains[var] for var in var_names]
+    manager = EvmddManager(var_names, var_domains, fully_reduced)
+    terms = list(terms)
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(terms) <= 1:
+        return [_translate_term(read_function_term(function_term), manager, method)
+                for function_term in terms], manager
+
+    chunksize = max(1, len(terms) // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(var_names, var_domains, fully_reduced,
+                                       method)) as executor:
+        results = []
+        for function_term, flat in zip(terms, executor.map(
+                _build_flat, terms, chunksize=chunksize)):
+            if flat is None:
+                results.append(_translate_term(read_function_term(function_term),
+                                               manager, method))
+                continue
+            (levels, child_offsets, child_weights, child_succs,
+             root_weight, root) = flat
+            compact = CompactEvmdd(levels, child_offsets, child_weights, child_succs,
+                                   root_weight, root, fully_reduced, manager)
+            results.append(compact.to_evmdd())
+    return results, manager
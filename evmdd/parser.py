@@ -28,9 +28,14 @@ from numbers import Integral
 from .evmdd import EvmddManager
 
 _LEGAL_EXPRESSIONS = [ast.Expression, ast.Load, ast.BinOp,
-                      ast.Add, ast.Mult, ast.Num, ast.Name,
+                      ast.Add, ast.Mult, ast.Constant, ast.Name,
                       ast.UnaryOp, ast.USub, ast.Sub, ast.Pow]
 
+def _is_integer_constant(node):
+    """Check whether the AST `node` is an integer constant."""
+    return (isinstance(node, ast.Constant) and isinstance(node.value, Integral) and
+            not isinstance(node.value, bool))
+
 def read_function_term(function_term):
     """Read a function term and transform it into an AST.
 
@@ -40,10 +45,25 @@ def read_function_term(function_term):
 
     Returns:
         `AST`: the abstract syntax tree representing function_term.
+
+    Note:
+        Fails with a `ValueError` if the term contains a constant that is
+        not an integer.
+
+    Example:
+        >>> read_function_term('2*A + 1') is not None
+        True
+        >>> read_function_term('A + 1.5')
+        Traceback (most recent call last):
+            ...
+        ValueError: Expected an integer constant, got 1.5.
     """
     expression = ast.parse(function_term, mode='eval')
     for node in ast.walk(expression):
         assert type(node) in _LEGAL_EXPRESSIONS
+        if isinstance(node, ast.Constant) and not _is_integer_constant(node):
+            raise ValueError('Expected an integer constant, got %r.' %
+                             (node.value,))
     return expression
 
 def collect_variables(function_term_ast):
@@ -62,9 +82,81 @@ def collect_variables(function_term_ast):
             variables.add(name)
     return variables
 
-def _to_evmdd_rec(node, manager):
-    """Translate a function term represented as an AST to the corresponding
-    EVMDD recursively.
+def _flatten_sum(node):
+    """Flatten nested additions, subtractions and negations into a list of
+    signed summands.
+
+    Args:
+        `node` (AST node): the root of the term to be flattened.
+
+    Returns:
+        `list[(int, AST node)]`: pairs of a sign (:math:`+1` or :math:`-1`)
+        and a summand that is neither an addition, nor a subtraction, nor a
+        negation, in left-to-right order.
+    """
+    summands = []
+    stack = [(1, node)]
+    while stack:
+        sign, node = stack.pop()
+        if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Add, ast.Sub)):
+            right_sign = sign if isinstance(node.op, ast.Add) else -sign
+            stack.append((right_sign, node.right))
+            stack.append((sign, node.left))
+        elif isinstance(node, ast.UnaryOp):
+            assert isinstance(node.op, ast.USub)
+            stack.append((-sign, node.operand))
+        else:
+            summands.append((sign, node))
+    return summands
+
+def _flatten_product(node):
+    """Flatten nested multiplications into a list of factors.
+
+    Args:
+        `node` (AST node): the root of the term to be flattened.
+
+    Returns:
+        `list[AST node]`: the factors that are not multiplications themselves,
+        in left-to-right order.
+    """
+    factors = []
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Mult):
+            stack.append(node.right)
+            stack.append(node.left)
+        else:
+            factors.append(node)
+    return factors
+
+def _combine_balanced(operands, combine):
+    """Combine a non-empty list of operands pairwise in a balanced binary tree.
+
+    Compared to a left-deep chain, this keeps the intermediate |EVMDDs|
+    small, since each intermediate result only covers a contiguous block
+    of the operands.
+    """
+    while len(operands) > 1:
+        combined = [combine(operands[idx], operands[idx+1])
+                    for idx in range(0, len(operands) - 1, 2)]
+        if len(operands) % 2:
+            combined.append(operands[-1])
+        operands = combined
+    return operands[0]
+
+def _combine_signed(summand1, summand2):
+    """Add two signed summands, given as pairs of a sign and an |EVMDD|."""
+    sign1, evmdd1 = summand1
+    sign2, evmdd2 = summand2
+    if sign1 == sign2:
+        return sign1, evmdd1 + evmdd2
+    elif sign1 > 0:
+        return 1, evmdd1 - evmdd2
+    return 1, evmdd2 - evmdd1
+
+class _TermTranslator(object):
+    """Translator of function terms represented as ASTs to |EVMDDs|.
 
     Base cases: if the given term is a number or a variable, return the
     corresponding constant or variable |EVMDD|. Recursive cases: if the
@@ -72,46 +164,105 @@ def _to_evmdd_rec(node, manager):
     exponent, or unary negation, recurse into the subexpressions, recursively
     translate them, and compose the sub-|EVMDDs| accordingly.
 
-    Args:
-        `node` (AST node): the abstract syntax tree node representing the
-        arithmetic term to be translated into an |EVMDD|.
-
-        `manager` (EvmddManager): the manager responsible for `node`.
-
-    Returns:
-        `Edge`: the corresponding |EVMDD|.
+    Nested sums (including differences and negations) and nested products
+    are flattened into n-ary sums and products, whose operands are combined
+    in a balanced way (see `_combine_balanced`). Every subterm is identified
+    by a structural key built from the IDs of its operands, where operands
+    of sums and products are sorted, such that syntactically repeated
+    subterms, also up to commutativity, are only translated once.
     """
-    if isinstance(node, ast.Num):
-        return manager.make_const_evmdd(int(node.n))
-    elif isinstance(node, ast.Name):
-        return manager.make_var_evmdd_for_var(node.id)
-    elif isinstance(node, ast.BinOp):
-        left = _to_evmdd_rec(node.left, manager)
-        right = _to_evmdd_rec(node.right, manager)
-        if isinstance(node.op, ast.Add):
-            return left + right
-        elif isinstance(node.op, ast.Sub):
-            return left - right
+
+    def __init__(self, manager):
+        self._manager = manager
+        self._subterm_ids = {}
+        self._evmdds = []
+
+    def translate(self, node):
+        """Translate the AST `node` to the corresponding |EVMDD|."""
+        return self._evmdds[self._translate(node)]
+
+    def _intern(self, key, make_evmdd):
+        """Get the ID of the subterm with structural `key`, translating it
+        with `make_evmdd` if it has not been encountered before."""
+        subterm_id = self._subterm_ids.get(key)
+        if subterm_id is None:
+            evmdd = make_evmdd()
+            subterm_id = len(self._evmdds)
+            self._evmdds.append(evmdd)
+            self._subterm_ids[key] = subterm_id
+        return subterm_id
+
+    def _translate(self, node):
+        """Translate the AST `node` and return the ID of its subterm."""
+        manager = self._manager
+        if isinstance(node, ast.Constant):
+            value = int(node.value)
+            return self._intern(('num', value), lambda: manager.make_const_evmdd(value))
+        elif isinstance(node, ast.Name):
+            return self._intern(('var', node.id),
+                                lambda: manager.make_var_evmdd_for_var(node.id))
+        elif isinstance(node, ast.UnaryOp) or isinstance(node.op, (ast.Add, ast.Sub)):
+            summands = sorted([(sign, self._translate(summand))
+                               for sign, summand in _flatten_sum(node)])
+            return self._intern(('+', tuple(summands)), lambda: self._make_sum(summands))
         elif isinstance(node.op, ast.Mult):
-            return left * right
+            factors = sorted([self._translate(factor)
+                              for factor in _flatten_product(node)])
+            return self._intern(('*', tuple(factors)), lambda: self._make_product(factors))
         else:
             assert isinstance(node.op, ast.Pow)
-            if ((not isinstance(node.right, ast.Num)) or
-                (not isinstance(node.right.n, Integral)) or
-                (node.right.n < 0)):
+            if not _is_integer_constant(node.right) or node.right.value < 0:
                 raise ValueError("EVMDDs may only be raised to a nonnegative integral power.")
-            return left ** node.right.n
-    else:
-        assert isinstance(node, ast.UnaryOp)
-        assert isinstance(node.op, ast.USub)
-        return -_to_evmdd_rec(node.operand, manager)
+            base = self._translate(node.left)
+            exponent = node.right.value
+            return self._intern(('**', base, exponent),
+                                lambda: self._evmdds[base] ** exponent)
+
+    def _make_sum(self, summands):
+        summands = [(sign, self._evmdds[subterm_id]) for sign, subterm_id in summands]
+        sign, evmdd = _combine_balanced(summands, _combine_signed)
+        return evmdd if sign > 0 else -evmdd
+
+    def _make_product(self, factors):
+        factors = [self._evmdds[subterm_id] for subterm_id in factors]
+        return _combine_balanced(factors, lambda evmdd1, evmdd2: evmdd1 * evmdd2)
+
+
+def _resolve_variables(function_term_ast, kwargs):
+    """Determine the variable order, the domain sizes and the reduction type
+    of the manager for a function term from the arguments of `term_to_evmdd`.
+
+    Returns:
+        a tuple consisting of the list of variable names in order, the list
+        of their domain sizes in the same order, and the flag
+        `fully_reduced`.
+    """
+    var_names = kwargs.get('var_names', None)
+    var_domains = kwargs.get('var_domains', None)
+    fully_reduced = kwargs.get('fully_reduced', True)
+    ordering = kwargs.get('ordering', None)
+
+    if not var_names:
+        var_names = sorted(list(collect_variables(function_term_ast)))
+
+    assert collect_variables(function_term_ast) <= set(var_names)
+
+    if not var_domains:
+        var_domains = {var: 2 for var in var_names}
+
+    assert all([var in var_domains for var in var_names])
+    if ordering is not None:
+        from .ordering import order_variables
+        var_names = order_variables(function_term_ast, var_names, var_domains, ordering)
+    return list(var_names), [var_domains[var] for var in var_names], fully_reduced
 
 def term_to_evmdd(function_term, **kwargs):
-    """Translate a function term to the corresponding |EVMDD|.
+    r"""Translate a function term to the corresponding |EVMDD|.
 
     The variable names in the desired variable ordering can be optionally
     specified. If no variable ordering is specified, the variable names are
-    determined from the function term and ordered lexicographically.
+    determined from the function term and ordered lexicographically, unless
+    a static ordering heuristic is selected (see `evmdd.ordering`).
 
     Also, the user may optionally specify the domain sizes of the variables.
     If no domain sized are specified, they default to 2 for all variables.
@@ -123,9 +274,17 @@ def term_to_evmdd(function_term, **kwargs):
 
         \*\*\ `kwargs`: optionally, the variable names in the desired ordering,
         `var_names` (list of strings), their domain sizes `var_domains`
-        (dict from strings to ints), and a flag `fully_reduced`
+        (dict from strings to ints), a flag `fully_reduced`
         determining whether the |EVMDD| should be fully reduced or
-        quasi-reduced.
+        quasi-reduced, and the construction `method`. The method
+        ``'apply'`` (default) composes the |EVMDD| operator by operator,
+        whereas ``'polynomial'`` first expands the term into a polynomial
+        in normal form and builds the |EVMDD| directly from its monomials
+        (see `evmdd.polynomial`), which is faster for large sparse
+        polynomials. If the name of an `ordering` heuristic (one of
+        ``'lexicographic'``, ``'interaction'``, ``'force'``, and
+        ``'domain'``) is given, the variables are reordered by that
+        heuristic before construction.
 
     Returns:
         a tuple consisting of the corresponding |EVMDD| and its manager.
@@ -148,8 +307,8 @@ def term_to_evmdd(function_term, **kwargs):
         6
 
     The next example shows that this works across a range of function terms,
-    variable orderings, valuations, and both for fully and quasi-reduced
-    |EVMDDs|.
+    variable orderings, valuations, both for fully and quasi-reduced
+    |EVMDDs|, and for both construction methods.
 
     Example:
         >>> from itertools import permutations, product
@@ -182,13 +341,13 @@ def term_to_evmdd(function_term, **kwargs):
         >>> for expr in exprs:
         ...     var_set = collect_variables(expr)
         ...     var_domains = {var: domain_size for var in var_set}
-        ...     for fully_reduced in [True, False]:
+        ...     for fully_reduced, method in product([True, False], ['apply', 'polynomial']):
         ...         for var_names in permutations(var_set):
         ...             for valuation in product(range(domain_size), repeat=len(var_set)):
         ...                 valuation = {var:val for var, val in zip(var_names,valuation)}
         ...                 evmdd, manager = term_to_evmdd(expr,
         ...                                  var_names=var_names, var_domains=var_domains,
-        ...                                  fully_reduced=fully_reduced)
+        ...                                  fully_reduced=fully_reduced, method=method)
         ...                 actual = evaluate(evmdd, valuation, manager)
         ...                 expected = eval(expr, valuation)
         ...                 if actual != expected:
@@ -196,29 +355,37 @@ def term_to_evmdd(function_term, **kwargs):
         ...
         >>> all_results_as_expected
         True
-    """
-
-    var_names = kwargs.get('var_names', None)
-    var_domains = kwargs.get('var_domains', None)
-    fully_reduced = kwargs.get('fully_reduced', True)
-
-    function_term_ast = read_function_term(function_term)
-
-    if not var_names:
-        var_names = sorted(list(collect_variables(function_term_ast)))
 
-    assert collect_variables(function_term_ast) <= set(var_names)
-
-    if not var_domains:
-        var_domains = {var: 2 for var in var_names}
+    Ordering heuristics place interacting variables next to each other.
 
-    assert all([var in var_domains for var in var_names])
-    var_domains = [var_domains[var] for var in var_names]
+    Example:
+        >>> expr = 'A*D + B*E + C*F'
+        >>> evmdd, manager = term_to_evmdd(expr)
+        >>> evmdd.num_nodes()
+        15
+        >>> evmdd, manager = term_to_evmdd(expr, ordering='interaction')
+        >>> manager._var_names, evmdd.num_nodes()
+        (['A', 'D', 'B', 'E', 'C', 'F'], 7)
+    """
 
+    method = kwargs.get('method', 'apply')
+    function_term_ast = read_function_term(function_term)
+    var_names, var_domains, fully_reduced = _resolve_variables(function_term_ast, kwargs)
     manager = EvmddManager(var_names, var_domains, fully_reduced)
+    return _translate_term(function_term_ast, manager, method), manager
 
+def _translate_term(function_term_ast, manager, method):
+    """Translate a function term to an |EVMDD| of a given manager, using the
+    construction `method` (see `term_to_evmdd`)."""
     assert isinstance(function_term_ast, ast.Expression)
-    return _to_evmdd_rec(function_term_ast.body, manager), manager
+    assert collect_variables(function_term_ast) <= set(manager._var_names)
+    if method == 'polynomial':
+        from .polynomial import expand_polynomial, polynomial_to_evmdd
+        polynomial = expand_polynomial(function_term_ast, manager._var_names)
+        return polynomial_to_evmdd(polynomial, manager)
+    elif method != 'apply':
+        raise ValueError('Unknown construction method: %s' % method)
+    return _TermTranslator(manager).translate(function_term_ast.body)
 
 
 def _test():
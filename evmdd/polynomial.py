@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of the EVMDD Library for Python (pyevmdd).
+# Copyright (C) 2016 Robert Mattmüller
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Construction of |EVMDDs| from polynomials in normal form.
+
+Function terms are integer polynomials over finite-domain variables. Instead
+of composing |EVMDDs| operator by operator, this module first expands a
+function term into a map from monomials to coefficients, and then builds the
+|EVMDD| top-down by substituting the values of one variable after the other,
+without any calls to the general `apply` algorithm.
+
+Monomials are represented as tuples of pairs ``(position, exponent)``, sorted
+by the position of the variable in the variable order of the manager. The
+constant monomial is the empty tuple. Polynomials are dicts from monomials to
+nonzero integer coefficients.
+"""
+
+import ast
+
+from .evmdd import _make_node_evmdd
+
+def _add_to(polynomial, monomial, coefficient):
+    """Add `coefficient` times `monomial` to `polynomial` in place."""
+    coefficient = polynomial.get(monomial, 0) + coefficient
+    if coefficient:
+        polynomial[monomial] = coefficient
+    else:
+        polynomial.pop(monomial, None)
+
+def _multiply_monomials(monomial1, monomial2):
+    """Multiply two monomials by merging their sorted variable positions."""
+    exponents = dict(monomial1)
+    for position, exponent in monomial2:
+        exponents[position] = exponents.get(position, 0) + exponent
+    return tuple(sorted(exponents.items()))
+
+def _multiply(polynomial1, polynomial2):
+    """Multiply two polynomials."""
+    product = {}
+    for monomial1, coefficient1 in polynomial1.items():
+        for monomial2, coefficient2 in polynomial2.items():
+            _add_to(product, _multiply_monomials(monomial1, monomial2),
+                    coefficient1 * coefficient2)
+    return product
+
+def _power(polynomial, exponent):
+    """Raise a polynomial to a nonnegative integral power by repeated squaring."""
+    result = {(): 1}
+    while exponent:
+        if exponent & 1:
+            result = _multiply(result, polynomial)
+        exponent >>= 1
+        if exponent:
+            polynomial = _multiply(polynomial, polynomial)
+    return result
+
+def expand_polynomial(function_term_ast, var_names):
+    """Expand a function term into a polynomial in normal form.
+
+    Args:
+        `function_term_ast`: a term represented as an abstract syntax tree,
+        as returned by `read_function_term`.
+
+        `var_names` (list of strings): the variable names in the desired
+        variable order.
+
+    Returns:
+        `dict`: a map from monomials to nonzero coefficients (see module
+        documentation).
+
+    Example:
+        >>> from .parser import read_function_term
+        >>> term = read_function_term('(A + B)**2 - B*B + 3')
+        >>> sorted(expand_polynomial(term, ['A', 'B']).items())
+        [((), 3), (((0, 1), (1, 1)), 2), (((0, 2),), 1)]
+    """
+    from .parser import _flatten_sum, _flatten_product, _is_integer_constant
+
+    positions = {var: position for position, var in enumerate(var_names)}
+
+    def expand(node):
+        if isinstance(node, ast.Expression):
+            return expand(node.body)
+        elif isinstance(node, ast.Constant):
+            value = int(node.value)
+            return {(): value} if value else {}
+        elif isinstance(node, ast.Name):
+            return {((positions[node.id], 1),): 1}
+        elif isinstance(node, ast.UnaryOp) or isinstance(node.op, (ast.Add, ast.Sub)):
+            result = {}
+            for sign, summand in _flatten_sum(node):
+                for monomial, coefficient in expand(summand).items():
+                    _add_to(result, monomial, sign * coefficient)
+            return result
+        elif isinstance(node.op, ast.Mult):
+            result = {(): 1}
+            for factor in _flatten_product(node):
+                result = _multiply(result, expand(factor))
+            return result
+        else:
+            assert isinstance(node.op, ast.Pow)
+            if not _is_integer_constant(node.right) or node.right.value < 0:
+                raise ValueError("EVMDDs may only be raised to a nonnegative integral power.")
+            return _power(expand(node.left), node.right.value)
+
+    return expand(function_term_ast)
+
+def _substitute(polynomial, position, value):
+    """Substitute `value` for the variable at `position`, assuming that no
+    variable above it occurs in `polynomial`."""
+    result = {}
+    for monomial, coefficient in polynomial.items():
+        if monomial and monomial[0][0] == position:
+            _add_to(result, monomial[1:], coefficient * value ** monomial[0][1])
+        else:
+            _add_to(result, monomial, coefficient)
+    return result
+
+def polynomial_to_evmdd(polynomial, manager):
+    """Build the |EVMDD| for a polynomial in normal form.
+
+    The |EVMDD| is built top-down: the polynomial branches on the top-most
+    variable (in the variable order of `manager`) occurring in it, and for
+    each value of that variable, the sub-|EVMDD| is built for the polynomial
+    obtained by substituting that value. Constant terms are split off before
+    branching, such that polynomials that only differ in their constant term
+    are only built once.
+
+    In the quasi-reduced case, below the top-most node, every level is
+    branched over on every path, also if the polynomial does not depend on
+    the variable of that level.
+
+    Args:
+        `polynomial` (dict): a polynomial as returned by `expand_polynomial`
+        for the variable names of `manager`.
+
+        `manager` (EvmddManager): the manager of the new |EVMDD|.
+
+    Returns:
+        `Edge`: the |EVMDD| representing `polynomial`.
+
+    Example:
+        >>> from .evmdd import EvmddManager
+        >>> from .parser import read_function_term
+        >>> manager = EvmddManager(['A', 'B'], [2, 3])
+        >>> polynomial = expand_polynomial(read_function_term('A*B + 1'), ['A', 'B'])
+        >>> evmdd = polynomial_to_evmdd(polynomial, manager)
+        >>> a = manager.make_var_evmdd_for_var('A')
+        >>> b = manager.make_var_evmdd_for_var('B')
+        >>> evmdd is a * b + 1
+        True
+    """
+    num_vars = len(manager._var_names)
+    fully_reduced = manager._fully_reduced
+    cache = {}
+
+    def build(polynomial, level):
+        """Build the |EVMDD| for `polynomial`, branching over `level` first,
+        or over its top-most variable if `level` is `None`."""
+        constant = polynomial.pop((), 0)
+        if not polynomial and (level is None or level == 0):
+            return manager.make_const_evmdd(constant)
+        if level is None:
+            level = num_vars - min([monomial[0][0] for monomial in polynomial])
+        key = (level, frozenset(polynomial.items()))
+        result = cache.get(key)
+        if result is None:
+            position = num_vars - level
+            child_level = None if fully_reduced else level - 1
+            children = [build(_substitute(polynomial, position, value), child_level)
+                        for value in range(manager._level_to_domain_size(level))]
+            result = _make_node_evmdd(level, children, fully_reduced)
+            cache[key] = result
+        return result + constant
+
+    return build(dict(polynomial), None)
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of the EVMDD Library for Python (pyevmdd).
+# Copyright (C) 2016 Robert Mattmüller
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Conversion between quasi-reduced and fully reduced |EVMDDs|.
+
+Both conversions rebuild an |EVMDD| bottom-up in a single pass over its
+nodes and return the equivalent |EVMDD| of the other type in the same node
+store. Since unique tables distinguish the two types, a manager can hold
+fully reduced and quasi-reduced |EVMDDs| at the same time, e.g., to build
+compactly and then evaluate level by level. Arithmetic operations still
+require both operands to be of the same type.
+
+* `to_fully_reduced` rebuilds every node from its converted children and
+  Shannon-reduces it if all children agree.
+* `to_quasi_reduced` inserts a node with identical children for every level
+  skipped by an edge, such that every path tests every variable, and the
+  root node is on the topmost level.
+
+The converted sub-|EVMDD| of each node (for `to_quasi_reduced`, of each node
+and each level it is lifted to) is computed once per conversion, so both
+conversions take time linear in the size of their result. Results are also
+cached in the `conversion_table` of the node store, so converting |EVMDDs|
+with shared parts, or converting the same |EVMDD| again, reuses earlier work.
+"""
+
+from .evmdd import Edge, Node, POSTORDER, _make_node_evmdd, _make_sink_node
+
+class _Converter(object):
+    """Conversion of the |EVMDDs| of one node store, with results cached for
+    the current conversion and in the conversion table of the store."""
+
+    def __init__(self, store, manager):
+        self._store = store
+        self._manager = manager
+        self._memo = {}
+
+    def _lookup(self, key):
+        result = self._memo.get(key)
+        if result is None:
+            result = self._store.conversion_table.lookup(key)
+            if result is not None:
+                self._memo[key] = result
+        return result
+
+    def _insert(self, key, result):
+        self._memo[key] = result
+        self._store.conversion_table.insert(key, result)
+
+    def fully_reduce(self, evmdd):
+        """Get the fully reduced |EVMDD| for the function of the node below
+        `evmdd`, converting all nodes in post-order."""
+        sink = _make_sink_node(True, self._store)
+        for node in evmdd.iter_nodes(POSTORDER):
+            key = ('fully_reduced', node.id)
+            if self._lookup(key) is not None:
+                continue
+            if node.is_sink_node():
+                result = Edge(0, sink, True)
+            else:
+                children = []
+                for child in node.children:
+                    sub_result = self._lookup(('fully_reduced', child.succ.id))
+                    children.append(Edge(child.weight + sub_result.weight,
+                                         sub_result.succ, True))
+                result = _make_node_evmdd(node.level, children, True)
+            self._insert(key, result)
+        return self._lookup(('fully_reduced', evmdd.succ.id))
+
+    def _lift(self, node, level):
+        """Get the quasi-reduced |EVMDD| for the function of `node`, whose own
+        quasi-reduced form has already been computed, with its root node on
+        `level`. Missing nodes for the skipped levels are added bottom-up,
+        starting above the highest level already computed."""
+        lower = level
+        result = self._lookup(('quasi_reduced', node.id, lower))
+        while result is None:
+            lower -= 1
+            result = self._lookup(('quasi_reduced', node.id, lower))
+        while lower < level:
+            lower += 1
+            domain_size = self._manager._level_to_domain_size(lower)
+            children = [Edge(0, result.succ, False)] * domain_size
+            result = Edge(result.weight, Node(lower, children, False), False)
+            self._insert(('quasi_reduced', node.id, lower), result)
+        return result
+
+    def quasi_reduce(self, evmdd):
+        """Get the quasi-reduced |EVMDD| for the function of the node below
+        `evmdd`, with its root node on the topmost level, converting all
+        nodes in post-order."""
+        sink = _make_sink_node(False, self._store)
+        for node in evmdd.iter_nodes(POSTORDER):
+            key = ('quasi_reduced', node.id, node.level)
+            if self._lookup(key) is not None:
+                continue
+            if node.is_sink_node():
+                result = Edge(0, sink, False)
+            else:
+                children = []
+                for child in node.children:
+                    sub_result = self._lift(child.succ, node.level - 1)
+                    children.append(Edge(child.weight + sub_result.weight,
+                                         sub_result.succ, False))
+                result = _make_node_evmdd(node.level, children, False)
+            self._insert(key, result)
+        return self._lift(evmdd.succ, len(self._manager._var_names))
+
+def to_fully_reduced(evmdd, manager):
+    """Convert an |EVMDD| to a fully reduced |EVMDD|.
+
+    Args:
+        `evmdd` (Edge): a quasi-reduced or fully reduced |EVMDD|.
+
+        `manager` (EvmddManager): the manager of `evmdd`.
+
+    Returns:
+        `Edge`: the fully reduced |EVMDD| representing the same function.
+        If `evmdd` is already fully reduced, it is returned unchanged.
+
+    Example:
+        >>> from .evmdd import EvmddManager, evaluate
+        >>> manager = EvmddManager(['A', 'B'], [2, 3], fully_reduced=False)
+        >>> a = manager.make_var_evmdd_for_var('A')
+        >>> b = manager.make_var_evmdd_for_var('B')
+        >>> quasi = a * 0 + b
+        >>> quasi.num_nodes()
+        3
+        >>> fully = to_fully_reduced(quasi, manager)
+        >>> fully.is_fully_reduced, fully.num_nodes()
+        (True, 2)
+        >>> evaluate(fully, {'A': 1, 'B': 2}, manager)
+        2
+    """
+    if evmdd.is_fully_reduced:
+        return evmdd
+    result = _Converter(evmdd.succ.store, manager).fully_reduce(evmdd)
+    return Edge(evmdd.weight + result.weight, result.succ, True)
+
+def to_quasi_reduced(evmdd, manager):
+    """Convert an |EVMDD| to a quasi-reduced |EVMDD|.
+
+    Args:
+        `evmdd` (Edge): a fully reduced or quasi-reduced |EVMDD|.
+
+        `manager` (EvmddManager): the manager of `evmdd`.
+
+    Returns:
+        `Edge`: the quasi-reduced |EVMDD| representing the same function,
+        whose root node is on the topmost level of `manager` and in which
+        every edge leads to the level directly below its source.
+
+    Example:
+        >>> from .evmdd import EvmddManager, evaluate
+        >>> manager = EvmddManager(['A', 'B', 'C'], [2, 3, 2])
+        >>> a = manager.make_var_evmdd_for_var('A')
+        >>> c = manager.make_var_evmdd_for_var('C')
+        >>> fully = a * c + 1
+        >>> fully.num_nodes()
+        3
+        >>> quasi = to_quasi_reduced(fully, manager)
+        >>> quasi.is_fully_reduced, quasi.num_nodes()
+        (False, 6)
+        >>> evaluate(quasi, {'A': 1, 'B': 2, 'C': 1}, manager)
+        2
+        >>> to_fully_reduced(quasi, manager) is fully
+        True
+    """
+    result = _Converter(evmdd.succ.store, manager).quasi_reduce(evmdd)
+    return Edge(evmdd.weight + result.weight, result.succ, False)
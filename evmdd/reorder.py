@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of the EVMDD Library for Python (pyevmdd).
+# Copyright (C) 2016 Robert Mattmüller
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Dynamic variable reordering of fully reduced |EVMDDs|.
+
+Reordering changes the variable order of a manager *in place*: all live nodes
+of the manager keep their identity and the function they represent, but are
+restructured such that they test the variables in the new order. Existing
+`Edges` held by client code therefore remain valid |EVMDDs| and evaluate to
+the same values as before.
+
+The primitive operation is the swap of two adjacent levels (see
+`swap_adjacent_levels`). Consider a node `f` on the upper level `L+1`, testing
+variable `x`, and the variable `y` of the lower level `L`. If none of the
+children of `f` is on level `L`, `f` does not depend on `y`, and `f` is simply
+moved down to level `L`. Nodes on level `L` are moved up to level `L+1`.
+Otherwise, `f` is rewritten in place to test `y` first, and its new children
+are the (possibly new) nodes on level `L` that test `x` for each fixed value
+of `y`. Since all nodes keep their IDs, the keys of the edges in the unique
+table do not change.
+
+Sifting (see `sift`) moves each variable in turn through all levels by
+adjacent swaps and leaves it at the level where the number of live nodes of
+the manager was smallest [Rudell, 1993].
+
+`CompactEvmdd` objects created before reordering refer to the old variable
+order and have to be recreated afterwards. Using them raises a `ValueError`.
+`CompiledEvmdd` objects look up variables by name and remain valid.
+
+Reordering is only supported for managers of fully reduced |EVMDDs| that do
+not hold any live quasi-reduced |EVMDDs| (see `reduction.to_quasi_reduced`).
+Quasi-reduced results that are only kept alive by the conversion table of
+the manager are released before this is checked.
+"""
+
+import weakref
+
+from .evmdd import Edge, _make_node_evmdd, _node_key
+
+def _has_quasi_reduced_nodes(store):
+    """Test if quasi-reduced |EVMDDs| of `store` are live, not counting those
+    only kept alive by cached conversion results, which are released."""
+    store.conversion_table.flush()
+    return any([node.level > 0 and not node.is_fully_reduced
+                for node in store.nodes.values()])
+
+def _check_fully_reduced(manager):
+    if not manager._fully_reduced:
+        raise ValueError('Variable reordering requires fully reduced EVMDDs.')
+    if _has_quasi_reduced_nodes(manager._store):
+        raise ValueError('Variable reordering requires fully reduced EVMDDs, '
+                         'but quasi-reduced EVMDDs of this manager are live.')
+
+def _make_level_index(store):
+    """Map each level to a weak set of the live nodes of `store` on that level."""
+    index = {}
+    for node in store.nodes.values():
+        index.setdefault(node.level, weakref.WeakSet()).add(node)
+    return index
+
+def _nodes_on_level(store, index, level):
+    if index is None:
+        return [node for node in store.nodes.values() if node.level == level]
+    return list(index.get(level, ()))
+
+def _relabel(unique_table, node, level):
+    """Move `node` to `level`, assuming its old key has been removed."""
+    node.level = level
+    unique_table.reinsert(_node_key(level, node.children, True), node)
+
+def swap_adjacent_levels(manager, level, index=None):
+    """Swap the variables on levels `level` and `level+1` of `manager`.
+
+    All live |EVMDDs| of `manager` are restructured in place, and the variable
+    order of `manager` is updated accordingly.
+
+    Args:
+        `manager` (EvmddManager): a manager of fully reduced |EVMDDs|.
+
+        `level` (int): the lower of the two levels to swap, between 1 and the
+        number of variables minus one.
+
+        `index` (dict, optional): a map from levels to weak sets of the live
+        nodes on these levels, as maintained by `sift`. If given, it is kept
+        up to date.
+
+    Example:
+        >>> from .evmdd import EvmddManager, evaluate
+        >>> manager = EvmddManager(['A', 'B'], [2, 3])
+        >>> a = manager.make_var_evmdd_for_var('A')
+        >>> b = manager.make_var_evmdd_for_var('B')
+        >>> evmdd = a * b + b
+        >>> swap_adjacent_levels(manager, 1)
+        >>> manager._var_names
+        ['B', 'A']
+        >>> evmdd.succ.level, manager.var_name_of(evmdd.succ)
+        (2, 'B')
+        >>> evaluate(evmdd, {'A': 1, 'B': 2}, manager)
+        4
+        >>> evmdd is manager.make_var_evmdd_for_var('B') * (a + 1)
+        True
+    """
+    if index is None:
+        _check_fully_reduced(manager)
+    num_vars = len(manager._var_names)
+    if not 1 <= level < num_vars:
+        raise ValueError('Cannot swap level %d with the level above.' % level)
+    store = manager._store
+    unique_table = store.nodes
+    upper = level + 1
+
+    y_domain_size = manager._level_to_domain_size(level)
+    x_nodes = _nodes_on_level(store, index, upper)
+    y_nodes = _nodes_on_level(store, index, level)
+    affected = []
+    unaffected = []
+    for node in x_nodes:
+        if any([child.succ.level == level for child in node.children]):
+            # cofactors[i][j]: the edge for x = i and y = j below `node`.
+            cofactors = []
+            for child in node.children:
+                succ = child.succ
+                if succ.level == level:
+                    cofactors.append([Edge(child.weight + grandchild.weight,
+                                           grandchild.succ, True)
+                                      for grandchild in succ.children])
+                else:
+                    cofactors.append([child] * y_domain_size)
+            affected.append((node, cofactors))
+        else:
+            unaffected.append(node)
+
+    for node in x_nodes + y_nodes:
+        unique_table.remove(_node_key(node.level, node.children, True))
+    for node in y_nodes:
+        _relabel(unique_table, node, upper)
+    for node in unaffected:
+        _relabel(unique_table, node, level)
+
+    new_x_nodes = []
+    for node, cofactors in affected:
+        children = []
+        for j in range(len(cofactors[0])):
+            edge = _make_node_evmdd(level, [row[j] for row in cofactors], True)
+            if edge.succ.level == level:
+                new_x_nodes.append(edge.succ)
+            children.append(edge)
+        assert min([child.weight for child in children]) == 0
+        node.children = tuple(children)
+        _relabel(unique_table, node, upper)
+
+    if index is not None:
+        index[level] = weakref.WeakSet(unaffected + new_x_nodes)
+        index[upper] = weakref.WeakSet(y_nodes + [node for node, _ in affected])
+
+    names, domains = manager._var_names, manager._var_domains
+    lower_pos, upper_pos = num_vars - level, num_vars - upper
+    names[lower_pos], names[upper_pos] = names[upper_pos], names[lower_pos]
+    domains[lower_pos], domains[upper_pos] = domains[upper_pos], domains[lower_pos]
+    manager.order_version += 1
+
+def sift(manager, max_growth=1.2):
+    """Improve the variable order of `manager` by sifting.
+
+    Variables are processed in decreasing order of the number of nodes on
+    their level. Each variable is first moved to the closer end of the
+    variable order, then to the other end, and finally back to the level
+    where the number of live nodes was smallest. A variable stops moving in
+    one direction as soon as the number of live nodes exceeds `max_growth`
+    times the number of live nodes before it started moving.
+
+    The computed table of `manager` is flushed before sifting, such that only
+    nodes that are part of |EVMDDs| still referenced by client code are
+    counted.
+
+    Args:
+        `manager` (EvmddManager): a manager of fully reduced |EVMDDs|.
+
+        `max_growth` (float): the maximal relative growth of the number of
+        live nodes while moving a variable.
+
+    Returns:
+        `int`: the number of live nodes after sifting.
+
+    Example:
+        >>> from .parser import term_to_evmdd
+        >>> evmdd, manager = term_to_evmdd('A*B + C*D + E*F',
+        ...     var_names=['A', 'C', 'E', 'B', 'D', 'F'],
+        ...     var_domains={var: 2 for var in 'ABCDEF'})
+        >>> evmdd.num_nodes()
+        15
+        >>> sift(manager)
+        7
+        >>> evmdd.num_nodes()
+        7
+    """
+    _check_fully_reduced(manager)
+    store = manager._store
+    store.flush_caches()
+    num_vars = len(manager._var_names)
+    index = _make_level_index(store)
+
+    def size():
+        return len(store.nodes)
+
+    def move(level, target, limit, best):
+        """Move the variable at `level` to `target` one swap at a time and
+        track the best `(size, level)` seen."""
+        while level != target:
+            if level < target:
+                swap_adjacent_levels(manager, level, index)
+                level += 1
+            else:
+                swap_adjacent_levels(manager, level - 1, index)
+                level -= 1
+            best = min(best, (size(), level))
+            if size() > limit:
+                break
+        return level, best
+
+    var_names = sorted(manager._var_names, key=lambda var_name: -len(
+        index.get(manager._var_name_to_level(var_name), ())))
+    for var_name in var_names:
+        level = manager._var_name_to_level(var_name)
+        best = (size(), level)
+        limit = max_growth * best[0]
+        if level - 1 < num_vars - level:
+            ends = (1, num_vars)
+        else:
+            ends = (num_vars, 1)
+        for end in ends:
+            level, best = move(level, end, limit, best)
+        level, _ = move(level, best[1], float('inf'), best)
+    return size()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of the EVMDD Library for Python (pyevmdd).
+# Copyright (C) 2016 Robert Mattmüller
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Partial evaluation of |EVMDDs|.
+
+Restricting an |EVMDD| to a partial valuation fixes the values of some
+variables and yields the |EVMDD| of the remaining function over the other
+variables. At every node testing a fixed variable, only the edge for its
+value is followed, and the node is replaced by the restricted sub-|EVMDD|
+below that edge, shifted by the weight of that edge. All other nodes are
+rebuilt from their restricted children.
+
+The result of restricting a node only depends on the node and on the values
+of the fixed variables on lower levels. Results are cached under exactly
+this key, such that the cache can be shared between different partial
+valuations (see `restrict_many`).
+
+In fully reduced |EVMDDs|, the fixed variables no longer occur in the
+result. In quasi-reduced |EVMDDs|, every level is still branched over on
+every path, so the nodes of fixed variables are replaced by nodes whose
+outgoing edges all lead to the same sub-|EVMDD|.
+"""
+
+from .evmdd import Edge, _make_node_evmdd
+
+class _Restrictor(object):
+    """Restriction of |EVMDDs| of one manager with a shared cache."""
+
+    def __init__(self, manager):
+        self._manager = manager
+        self._cache = {}
+
+    def _fixed_values(self, partial_valuation):
+        """Map each level to the tuple of ``(level, value)`` pairs of the
+        fixed variables on that level and below."""
+        manager = self._manager
+        num_vars = len(manager._var_names)
+        values = {}
+        for var_name, value in partial_valuation.items():
+            if var_name not in manager._var_names:
+                raise ValueError('Unknown variable: %s' % var_name)
+            level = manager._var_name_to_level(var_name)
+            if not 0 <= value < manager._level_to_domain_size(level):
+                raise ValueError('Value %s outside domain of variable %s.' %
+                                 (value, var_name))
+            values[level] = value
+        fixed_values = [()]
+        for level in range(1, num_vars + 1):
+            below = fixed_values[-1]
+            if level in values:
+                below = ((level, values[level]),) + below
+            fixed_values.append(below)
+        return fixed_values
+
+    def restrict(self, evmdd, partial_valuation):
+        fixed_values = self._fixed_values(partial_valuation)
+        values = dict(fixed_values[-1])
+        cache = self._cache
+        is_fully_reduced = evmdd.is_fully_reduced
+        manager = self._manager
+
+        def key_of(node):
+            return (node.id, fixed_values[node.level])
+
+        def needed_succs(node):
+            """Get the successor nodes whose restrictions the restriction of
+            `node` is built from."""
+            if node.level in values:
+                return [node.children[values[node.level]].succ]
+            return [child.succ for child in node.children]
+
+        def restrict_node(node):
+            """Get the restricted |EVMDD| for the function of `node`, whose
+            needed successors have already been restricted."""
+            if node.is_sink_node():
+                return Edge(0, node, is_fully_reduced)
+            if node.level in values:
+                child = node.children[values[node.level]]
+                sub_result = cache[key_of(child.succ)]
+                result = Edge(child.weight + sub_result.weight, sub_result.succ,
+                              is_fully_reduced)
+                if not is_fully_reduced:
+                    domain_size = manager._level_to_domain_size(node.level)
+                    result = _make_node_evmdd(node.level, [result] * domain_size,
+                                              is_fully_reduced)
+                return result
+            children = []
+            for child in node.children:
+                sub_result = cache[key_of(child.succ)]
+                children.append(Edge(child.weight + sub_result.weight,
+                                     sub_result.succ, is_fully_reduced))
+            return _make_node_evmdd(node.level, children, is_fully_reduced)
+
+        # Depth-first with an explicit stack: a node is restricted once all
+        # its needed successors are in the cache.
+        stack = [evmdd.succ]
+        while stack:
+            node = stack[-1]
+            if key_of(node) in cache:
+                stack.pop()
+                continue
+            missing = [succ for succ in needed_succs(node) if key_of(succ) not in cache]
+            if missing:
+                stack.extend(missing)
+            else:
+                cache[key_of(node)] = restrict_node(node)
+                stack.pop()
+
+        result = cache[key_of(evmdd.succ)]
+        return Edge(evmdd.weight + result.weight, result.succ, is_fully_reduced)
+
+def restrict(evmdd, partial_valuation, manager):
+    """Restrict an |EVMDD| to a partial valuation.
+
+    Args:
+        `evmdd` (Edge): an |EVMDD|.
+
+        `partial_valuation` (dict from strings to ints): the values of the
+        variables to fix.
+
+        `manager` (EvmddManager): the manager of `evmdd`.
+
+    Returns:
+        `Edge`: the |EVMDD| of `manager` that agrees with `evmdd` on all
+        valuations extending `partial_valuation`, and does not depend on the
+        fixed variables.
+
+    Example:
+        >>> from .evmdd import evaluate
+        >>> from .parser import term_to_evmdd
+        >>> evmdd, manager = term_to_evmdd('A*B**2 + C + 2',
+        ...     var_names=['A', 'B', 'C'], var_domains={'A': 2, 'B': 3, 'C': 2})
+        >>> restricted = restrict(evmdd, {'A': 1, 'C': 0}, manager)
+        >>> restricted.num_nodes()
+        2
+        >>> [evaluate(restricted, {'B': b}, manager) for b in range(3)]
+        [2, 3, 6]
+        >>> restricted is manager.make_var_evmdd_for_var('B') ** 2 + 2
+        True
+    """
+    return _Restrictor(manager).restrict(evmdd, partial_valuation)
+
+def restrict_many(evmdd, partial_valuations, manager):
+    """Restrict an |EVMDD| to each of several partial valuations.
+
+    All restrictions share one cache, such that sub-|EVMDDs| whose fixed
+    variables have the same values for several partial valuations are only
+    restricted once.
+
+    Args:
+        `evmdd` (Edge): an |EVMDD|.
+
+        `partial_valuations` (iterable of dicts from strings to ints): the
+        partial valuations.
+
+        `manager` (EvmddManager): the manager of `evmdd`.
+
+    Returns:
+        `list[Edge]`: the restricted |EVMDD| for each partial valuation (see
+        `restrict`).
+
+    Example:
+        >>> from .parser import term_to_evmdd
+        >>> evmdd, manager = term_to_evmdd('A*B + C', var_names=['A', 'B', 'C'])
+        >>> c = manager.make_var_evmdd_for_var('C')
+        >>> results = restrict_many(evmdd, [{'A': 0}, {'A': 1, 'B': 1}], manager)
+        >>> [result is expected for result, expected in zip(results, [c, c + 1])]
+        [True, True]
+    """
+    restrictor = _Restrictor(manager)
+    return [restrictor.restrict(evmdd, partial_valuation)
+            for partial_valuation in partial_valuations]
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of the EVMDD Library for Python (pyevmdd).
+# Copyright (C) 2016 Robert Mattmüller
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Binary serialization of |EVMDDs|.
+
+An |EVMDD| is stored together with the variable order and domain sizes of its
+manager, in a versioned binary format consisting of a fixed-size header
+followed by the variables and the arrays of its compact form (see
+`CompactEvmdd`). All integers are little-endian.
+
+* Header: the magic bytes ``b'PYEVMDD\\0'``, the format version, a flag
+  whether the |EVMDD| is fully reduced, and the number of variables, each as
+  a 32-bit integer, then a reserved 32-bit word, which must be zero, and the
+  numbers of nodes and edges (excluding the dangling incoming edge), the
+  index of the root node and the weight of the dangling incoming edge, each
+  as a 64-bit integer. Readers reject files with a nonzero reserved word,
+  such that it can be given a meaning later without changing the format
+  version.
+* Variables: for each variable in the variable order, its domain size as a
+  64-bit integer, followed by, for each variable, the length of its UTF-8
+  encoded name as a 32-bit integer and the encoded name.
+* Arrays: the node levels as 32-bit integers, and the child offsets, edge
+  weights and edge successors as 64-bit integers.
+
+Each section starts at an offset divisible by 8. This allows to load the
+arrays via `mmap` without copying them (see `load_evmdd`): the resulting
+`CompactEvmdd` evaluates directly on the mapped file, and processes loading
+the same file share its pages through the page cache of the operating
+system.
+"""
+
+import mmap
+import struct
+import sys
+from array import array
+
+from .compact import CompactEvmdd, _LEVEL_TYPECODE, _INDEX_TYPECODE, _WEIGHT_TYPECODE
+from .evmdd import EvmddManager
+
+MAGIC = b'PYEVMDD\0'
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct('<8sIIIIqqqq')
+_RESERVED = 0
+_NAME_LENGTH = struct.Struct('<I')
+_ALIGNMENT = 8
+
+def _padding(size):
+    return -size % _ALIGNMENT
+
+def _write_array(stream, arr):
+    if sys.byteorder != 'little':
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    data = arr.tobytes()
+    stream.write(data)
+    stream.write(b'\0' * _padding(len(data)))
+
+def dump_evmdd(evmdd, manager, stream):
+    """Write an |EVMDD| and the variables of its manager to a binary stream.
+
+    Args:
+        `evmdd` (Edge or CompactEvmdd): an |EVMDD|.
+
+        `manager` (EvmddManager): the manager of `evmdd`.
+
+        `stream`: a binary file-like object open for writing.
+    """
+    compact = evmdd if isinstance(evmdd, CompactEvmdd) else CompactEvmdd.from_evmdd(evmdd)
+    compact._check_order_version()
+    var_names = manager._var_names
+    stream.write(_HEADER.pack(MAGIC, FORMAT_VERSION, int(compact.is_fully_reduced),
+                              len(var_names), _RESERVED, compact.num_nodes(),
+                              len(compact.child_weights), compact.root,
+                              compact.root_weight))
+    _write_array(stream, array('q', manager._var_domains))
+    names = bytearray()
+    for var_name in var_names:
+        encoded = var_name.encode('utf-8')
+        names += _NAME_LENGTH.pack(len(encoded)) + encoded
+    stream.write(bytes(names) + b'\0' * _padding(len(names)))
+    for arr in (compact.levels, compact.child_offsets,
+                compact.child_weights, compact.child_succs):
+        _write_array(stream, arr)
+
+def save_evmdd(evmdd, manager, path):
+    """Write an |EVMDD| and the variables of its manager to the file `path`.
+
+    See `dump_evmdd`.
+    """
+    with open(path, 'wb') as stream:
+        dump_evmdd(evmdd, manager, stream)
+
+def _read_array(buf, offset, typecode, length, copy):
+    """Read an array of `length` items from `buf` at `offset`.
+
+    Returns:
+        the array, which is a `memoryview` of `buf` unless `copy` is set or
+        the byte order of the machine is not little-endian, and the offset
+        of the next section.
+    """
+    itemsize = array(typecode).itemsize
+    end = offset + itemsize * length
+    if end > len(buf):
+        raise ValueError('Truncated EVMDD file.')
+    if copy or sys.byteorder != 'little':
+        arr = array(typecode)
+        arr.frombytes(buf[offset:end])
+        if sys.byteorder != 'little':
+            arr.byteswap()
+    else:
+        arr = memoryview(buf)[offset:end].cast('B').cast(typecode)
+    return arr, end + _padding(end)
+
+def loads_evmdd(buf, copy=True):
+    """Read an |EVMDD| and a new manager for its variables from a buffer.
+
+    Args:
+        `buf` (bytes-like): the binary representation of an |EVMDD|, as
+        written by `dump_evmdd`.
+
+        `copy` (bool): whether to copy the arrays out of `buf`. Otherwise,
+        the arrays of the result are views of `buf`.
+
+    Returns:
+        a tuple consisting of the `CompactEvmdd` and its manager.
+
+    Raises:
+        `ValueError`: if `buf` does not hold an |EVMDD| in a supported format
+        version.
+
+    Example:
+        >>> import io
+        >>> from .parser import term_to_evmdd
+        >>> evmdd, manager = term_to_evmdd('A + 2*B')
+        >>> stream = io.BytesIO()
+        >>> dump_evmdd(evmdd, manager, stream)
+        >>> loads_evmdd(stream.getvalue())[0].evaluate({'A': 1, 'B': 1})
+        3
+        >>> buf = bytearray(stream.getvalue())
+        >>> buf[20] = 1
+        >>> loads_evmdd(buf)
+        Traceback (most recent call last):
+            ...
+        ValueError: Unsupported EVMDD file: nonzero reserved header word.
+    """
+    if len(buf) < _HEADER.size:
+        raise ValueError('Truncated EVMDD file.')
+    (magic, version, fully_reduced, num_vars, reserved, num_nodes, num_edges,
+     root, root_weight) = _HEADER.unpack_from(buf, 0)
+    if magic != MAGIC:
+        raise ValueError('Not an EVMDD file.')
+    if version != FORMAT_VERSION:
+        raise ValueError('Unsupported EVMDD file format version: %d' % version)
+    if reserved != _RESERVED:
+        raise ValueError('Unsupported EVMDD file: nonzero reserved header word.')
+    offset = _HEADER.size
+    var_domains, offset = _read_array(buf, offset, 'q', num_vars, True)
+    var_names = []
+    for _ in range(num_vars):
+        length, = _NAME_LENGTH.unpack_from(buf, offset)
+        offset += _NAME_LENGTH.size
+        var_names.append(bytes(buf[offset:offset+length]).decode('utf-8'))
+        offset += length
+    offset += _padding(offset)
+    levels, offset = _read_array(buf, offset, _LEVEL_TYPECODE, num_nodes, copy)
+    child_offsets, offset = _read_array(buf, offset, _INDEX_TYPECODE, num_nodes + 1, copy)
+    child_weights, offset = _read_array(buf, offset, _WEIGHT_TYPECODE, num_edges, copy)
+    child_succs, offset = _read_array(buf, offset, _INDEX_TYPECODE, num_edges, copy)
+    manager = EvmddManager(var_names, list(var_domains), bool(fully_reduced))
+    compact = CompactEvmdd(levels, child_offsets, child_weights, child_succs,
+                           root_weight, root, bool(fully_reduced), manager)
+    return compact, manager
+
+def load_evmdd(path, use_mmap=True):
+    """Read an |EVMDD| and a new manager for its variables from the file `path`.
+
+    Args:
+        `path` (string): the name of a file written by `save_evmdd`.
+
+        `use_mmap` (bool): whether to map the file into memory instead of
+        reading it. The arrays of the result are then views of the mapped
+        file, which stays mapped as long as the result is referenced.
+
+    Returns:
+        a tuple consisting of the `CompactEvmdd` and its manager. Use
+        `EvmddManager.expand` to turn the compact |EVMDD| into an `Edge`.
+
+    Example:
+        >>> import os, tempfile
+        >>> from .evmdd import evaluate
+        >>> from .parser import term_to_evmdd
+        >>> evmdd, manager = term_to_evmdd('A*B**2 + C + 2',
+        ...     var_names=['A', 'B', 'C'], var_domains={'A': 2, 'B': 3, 'C': 2})
+        >>> path = os.path.join(tempfile.mkdtemp(), 'evmdd.bin')
+        >>> save_evmdd(evmdd, manager, path)
+        >>> compact, loaded_manager = load_evmdd(path)
+        >>> loaded_manager._var_names, loaded_manager._var_domains
+        (['A', 'B', 'C'], [2, 3, 2])
+        >>> evaluate(compact, {'A': 1, 'B': 2, 'C': 0}, loaded_manager)
+        6
+        >>> loaded_manager.compile(compact)((1, 2, 1))
+        7
+        >>> loaded = loaded_manager.expand(compact)
+        >>> loaded.num_nodes() == evmdd.num_nodes()
+        True
+    """
+    with open(path, 'rb') as stream:
+        if not use_mmap:
+            return loads_evmdd(stream.read(), copy=False)
+        buf = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+    return loads_evmdd(buf, copy=False)
@@ -20,48 +20,313 @@
 """Utilities for |EVMDD| library.
 """
 
-from functools import wraps
+import threading
+import weakref
+from collections import OrderedDict
 
-def memoize(obj):
-    """Memoizes an object.
+class UniqueTable(object):
+    """A unique table for hash-consing |EVMDD| nodes and edges.
 
-    We use memoization for |EVMDD| nodes and edges to avoid duplicate nodes with
-    identical level and children, and duplicate edges with identical weights and
-    successor nodes, respectively. Such |EVMDDs| would represent the same
-    arithmetic function, and it is both memory efficient to have only one copy
-    of each such |EVMDD|, and necessary to guarantee isomorphism reduction of
-    all constructed |EVMDDs|. If there is only one `EVMDD` object for each
-    arithmetic function, then all |EVMDDs| will be isomorphism reduced by
-    construction.
+    We use hash-consing for |EVMDD| nodes and edges to avoid duplicate nodes
+    with identical level and children, and duplicate edges with identical
+    weights and successor nodes, respectively. Such |EVMDDs| would represent
+    the same arithmetic function, and it is both memory efficient to have only
+    one copy of each such |EVMDD|, and necessary to guarantee isomorphism
+    reduction of all constructed |EVMDDs|. If there is only one `EVMDD` object
+    for each arithmetic function, then all |EVMDDs| will be isomorphism reduced
+    by construction.
 
-    Code taken from ``https://wiki.python.org/moin/PythonDecoratorLibrary#Memoize``.
+    Keys are structural and shallow, e.g., the level of a node together with
+    the integer IDs of its children. Since the children are already canonical,
+    their IDs identify them uniquely, and looking up an object never needs to
+    inspect the sub-diagram below it. Every object inserted into the table is
+    assigned a fresh integer ID in its attribute `id`. IDs are never reused.
+
+    The table only holds weak references to its objects. Once an object is no
+    longer referenced from anywhere else, it is reclaimed and silently
+    disappears from the table.
+
+    The table is safe for concurrent use by several threads, without relying
+    on a global interpreter lock. It is split into `num_locks` stripes by the
+    hash of the keys, each with its own dict and lock, such that two threads
+    can never both insert an object for the same key, while accesses to
+    different keys rarely contend. Entries of reclaimed objects are removed
+    under the lock of their stripe as well: if the lock is not available
+    when an object is reclaimed, e.g., because the reclaiming thread holds
+    it, the removal is queued and performed by the next access to the
+    stripe. `values` holds all locks while it takes its snapshot.
     """
-    cache = obj.cache = {}
 
-    @wraps(obj)
-    def memoizer(*args, **kwargs):
-        key = repr(args) + repr(kwargs)
-        if key not in cache:
-            cache[key] = obj(*args, **kwargs)
-        return cache[key]
-    return memoizer
+    def __init__(self, num_locks=64):
+        self._stripes = [{} for _ in range(num_locks)]
+        self._locks = [threading.Lock() for _ in range(num_locks)]
+        self._pending_removals = [[] for _ in range(num_locks)]
+        self._id_lock = threading.Lock()
+        self._next_id = 0
+        self.reset_statistics()
+
+        table_ref = weakref.ref(self)
+        def remove(ref):
+            table = table_ref()
+            if table is not None:
+                table._remove_dead(ref)
+        self._remove_callback = remove
+
+    def _remove_dead(self, ref):
+        """Remove the entry of a reclaimed object, or queue its removal if
+        the lock of its stripe is not available."""
+        stripe = hash(ref.key) % len(self._locks)
+        self._pending_removals[stripe].append(ref)
+        lock = self._locks[stripe]
+        if lock.acquire(False):
+            try:
+                self._purge(stripe)
+            finally:
+                lock.release()
+
+    def _purge(self, stripe):
+        """Perform the queued removals of a stripe, whose lock must be held."""
+        pending = self._pending_removals[stripe]
+        table = self._stripes[stripe]
+        while pending:
+            ref = pending.pop()
+            if table.get(ref.key) is ref:
+                del table[ref.key]
+
+    def lookup(self, key):
+        """Get the canonical object for `key`, or `None` if there is none."""
+        stripe = hash(key) % len(self._locks)
+        with self._locks[stripe]:
+            if self._pending_removals[stripe]:
+                self._purge(stripe)
+            ref = self._stripes[stripe].get(key)
+            obj = ref() if ref is not None else None
+            if obj is None:
+                self._misses[stripe] += 1
+            else:
+                self._hits[stripe] += 1
+        return obj
+
+    def insert(self, key, obj):
+        """Register `obj` as the canonical object for `key` and assign it an ID,
+        unless another thread has registered an object for `key` in the
+        meantime.
+
+        Returns:
+            the canonical object for `key`, i.e., `obj` or the object
+            registered by the other thread.
+        """
+        stripe = hash(key) % len(self._locks)
+        with self._locks[stripe]:
+            if self._pending_removals[stripe]:
+                self._purge(stripe)
+            table = self._stripes[stripe]
+            ref = table.get(key)
+            canonical = ref() if ref is not None else None
+            if canonical is not None:
+                return canonical
+            with self._id_lock:
+                obj.id = self._next_id
+                self._next_id += 1
+            table[key] = weakref.KeyedRef(obj, self._remove_callback, key)
+        return obj
+
+    def remove(self, key):
+        """Remove the object registered for `key` from the table.
+
+        Together with `reinsert`, this allows to change the key of an object
+        that is modified in place without changing its ID.
+        """
+        stripe = hash(key) % len(self._locks)
+        with self._locks[stripe]:
+            del self._stripes[stripe][key]
+
+    def reinsert(self, key, obj):
+        """Register the object `obj`, which keeps its ID, under a new `key`."""
+        stripe = hash(key) % len(self._locks)
+        with self._locks[stripe]:
+            if self._pending_removals[stripe]:
+                self._purge(stripe)
+            table = self._stripes[stripe]
+            assert key not in table
+            table[key] = weakref.KeyedRef(obj, self._remove_callback, key)
+
+    def reset_statistics(self):
+        """Reset the numbers of successful and unsuccessful lookups."""
+        # One counter per lock, each only updated while holding its lock.
+        self._hits = [0] * len(self._locks)
+        self._misses = [0] * len(self._locks)
+
+    @property
+    def hits(self):
+        """The number of successful lookups."""
+        return sum(self._hits)
+
+    @property
+    def misses(self):
+        """The number of unsuccessful lookups."""
+        return sum(self._misses)
 
+    def values(self):
+        """Get a list of all live objects in the table."""
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            objs = [ref() for table in self._stripes for ref in table.values()]
+        finally:
+            for lock in self._locks:
+                lock.release()
+        return [obj for obj in objs if obj is not None]
 
-class EqualityMixin(object):
-    """Mixin used in other classes to provide a default ``==`` and ``!=`` test
-    and hash function.
+    def __len__(self):
+        # Entries of reclaimed objects whose removal is still queued are
+        # counted as well.
+        return sum([len(table) for table in self._stripes])
 
-    Equality, inequality and hash function are defined component-wise.
+
+class ComputedTable(object):
+    """A bounded cache for the results of operations on |EVMDDs|.
+
+    The computed table maps operation keys, e.g., an operator together with
+    the IDs and weights of the operand |EVMDDs|, to previously computed
+    results. Its size is bounded by `capacity` (unbounded if `None`). When the
+    table is full, entries are evicted according to `policy`:
+
+    * ``'lru'``: the least recently used entry is evicted.
+    * ``'direct-mapped'``: the table is a fixed array of `capacity` slots, and
+      each key can only be stored in the slot determined by its hash. A new
+      entry simply overwrites the previous occupant of its slot, as in CUDD.
+      This is lossy, but lookups and insertions never reorganize the table.
+
+    The table is safe for concurrent use by several threads, without relying
+    on a global interpreter lock. Like a `UniqueTable`, it is split into up to
+    `num_locks` stripes by the hash of the keys, and every access, including
+    the update of the hit and miss counters, only holds the lock of the
+    stripe of its key. With the LRU policy, each stripe is an LRU cache of
+    its own, holding its share of `capacity`, so the least recently used
+    entry of the stripe of a new key is evicted. With the direct-mapped
+    policy, the slots are distributed among the stripes.
+
+    Examples:
+        >>> table = ComputedTable(capacity=2, num_locks=1)
+        >>> table.insert('a', 1)
+        >>> table.insert('b', 2)
+        >>> table.lookup('a')
+        1
+        >>> table.insert('c', 3)
+        >>> table.lookup('b') is None
+        True
+        >>> len(table)
+        2
+        >>> table.flush()
+        >>> len(table)
+        0
     """
-    def __init__(self):
-        pass
 
-    def __eq__(self, other):
-        return (isinstance(other, self.__class__)
-                and self.__dict__ == other.__dict__)
+    LRU = 'lru'
+    DIRECT_MAPPED = 'direct-mapped'
+
+    def __init__(self, capacity=1 << 18, policy=LRU, num_locks=64):
+        if policy not in (self.LRU, self.DIRECT_MAPPED):
+            raise ValueError('Unknown computed table policy: %s' % policy)
+        if policy == self.DIRECT_MAPPED and not capacity:
+            raise ValueError('A direct-mapped computed table needs a capacity.')
+        self.capacity = capacity
+        self.policy = policy
+        num_locks = min(num_locks, capacity) if capacity else num_locks
+        self._locks = [threading.Lock() for _ in range(num_locks)]
+        self.flush()
+        self.reset_statistics()
+
+    def lookup(self, key):
+        """Get the cached result for `key`, or `None` if there is none."""
+        if self.policy == self.LRU:
+            stripe = hash(key) % len(self._locks)
+            with self._locks[stripe]:
+                table = self._stripes[stripe]
+                result = table.get(key)
+                if result is not None:
+                    table.move_to_end(key)
+                    self._hits[stripe] += 1
+                else:
+                    self._misses[stripe] += 1
+        else:
+            slot = hash(key) % self.capacity
+            stripe = slot % len(self._locks)
+            with self._locks[stripe]:
+                entry = self._slots[slot]
+                result = entry[1] if entry is not None and entry[0] == key else None
+                if result is not None:
+                    self._hits[stripe] += 1
+                else:
+                    self._misses[stripe] += 1
+        return result
+
+    def insert(self, key, result):
+        """Cache `result` under `key`, evicting another entry if necessary."""
+        if self.policy == self.LRU:
+            stripe = hash(key) % len(self._locks)
+            with self._locks[stripe]:
+                table = self._stripes[stripe]
+                table[key] = result
+                table.move_to_end(key)
+                capacity = self._stripe_capacities[stripe]
+                if capacity and len(table) > capacity:
+                    table.popitem(last=False)
+        else:
+            slot = hash(key) % self.capacity
+            stripe = slot % len(self._locks)
+            with self._locks[stripe]:
+                if self._slots[slot] is None:
+                    self._sizes[stripe] += 1
+                self._slots[slot] = (key, result)
+
+    def reset_statistics(self):
+        """Reset the numbers of successful and unsuccessful lookups."""
+        # One counter per lock, each only updated while holding its lock.
+        self._hits = [0] * len(self._locks)
+        self._misses = [0] * len(self._locks)
+
+    @property
+    def hits(self):
+        """The number of successful lookups."""
+        return sum(self._hits)
+
+    @property
+    def misses(self):
+        """The number of unsuccessful lookups."""
+        return sum(self._misses)
+
+    def _acquire_all(self):
+        for lock in self._locks:
+            lock.acquire()
+
+    def _release_all(self):
+        for lock in self._locks:
+            lock.release()
 
-    def __ne__(self, other):
-        return not self.__eq__(other)
+    def flush(self):
+        """Remove all entries from the table."""
+        num_stripes = len(self._locks)
+        self._acquire_all()
+        try:
+            if self.policy == self.LRU:
+                self._stripes = [OrderedDict() for _ in range(num_stripes)]
+                capacity = self.capacity
+                self._stripe_capacities = [
+                    capacity // num_stripes + (stripe < capacity % num_stripes)
+                    if capacity else None for stripe in range(num_stripes)]
+            else:
+                self._slots = self.capacity * [None]
+                self._sizes = num_stripes * [0]
+        finally:
+            self._release_all()
 
-    def __hash__(self):
-        return hash(frozenset(self.__dict__.items()))
+    def __len__(self):
+        self._acquire_all()
+        try:
+            if self.policy == self.LRU:
+                return sum([len(table) for table in self._stripes])
+            return sum(self._sizes)
+        finally:
+            self._release_all()
@@ -5,34 +5,55 @@ import sys
 import logging
 
 from evmdd.graphviz import EvmddVisualizer
+from evmdd.ordering import ORDERINGS
 from evmdd.parser import term_to_evmdd
 
+_ORDERING_OPTION = '--ordering='
+
 def _print_usage():
-    print('usage:   %s "<function term in Python syntax>"' % (
-        sys.argv[0]) + ' ["<variable ordering>" ["<variable domain sizes>"]]')
+    print('usage:   %s [%s<heuristic>] "<function term in Python syntax>"' % (
+        sys.argv[0], _ORDERING_OPTION) +
+          ' ["<variable ordering>" ["<variable domain sizes>"]]')
     print('example: %s "A*B*B + C + 2" "A, B, C" "2, 3, 2"' % sys.argv[0])
+    print('example: %s %sforce "A*B + C*D"' % (sys.argv[0], _ORDERING_OPTION))
+    print('heuristics: %s' % ', '.join(ORDERINGS))
 
 def _parse_comma_separated_list(line):
     return [s.strip() for s in line.split(',')]
 
+def _parse_ordering(args):
+    ordering = None
+    for arg in [arg for arg in args if arg.startswith(_ORDERING_OPTION)]:
+        ordering = arg[len(_ORDERING_OPTION):]
+        if ordering not in ORDERINGS:
+            print('ERROR: Unknown variable ordering heuristic: %s' % ordering)
+            _print_usage()
+            sys.exit()
+        args.remove(arg)
+    return ordering
+
 def _parse_command_line():
+    args = sys.argv[:]
+    ordering = _parse_ordering(args)
+
     try:
-        function_term = sys.argv[1]
+        function_term = args[1]
     except IndexError:
         print('ERROR: No function term specified.')
         _print_usage()
         sys.exit()
 
     try:
-        var_names = sys.argv[2]
+        var_names = args[2]
         var_names = _parse_comma_separated_list(var_names)
     except IndexError:
-        print('WARNING: No valid variable ordering specified.')
-        print('         Using lexicographic ordering.')
+        if ordering is None:
+            print('WARNING: No valid variable ordering specified.')
+            print('         Using lexicographic ordering.')
         var_names = None
 
     try:
-        var_domains = sys.argv[3]
+        var_domains = args[3]
         var_domains = _parse_comma_separated_list(var_domains)
         assert len(var_names) == len(var_domains)
         var_domains = {var: int(dom) for var, dom in zip(var_names, var_domains)}
@@ -42,12 +63,13 @@ def _parse_command_line():
         var_domains = None
         _print_usage()
 
-    return function_term, var_names, var_domains
+    return function_term, var_names, var_domains, ordering
 
 def main():
-    function_term, var_names, var_domains = _parse_command_line()
+    function_term, var_names, var_domains, ordering = _parse_command_line()
     evmdd, manager = term_to_evmdd(function_term,
-                                   var_names=var_names, var_domains=var_domains, fully_reduced=True)
+                                   var_names=var_names, var_domains=var_domains,
+                                   fully_reduced=True, ordering=ordering)
     visualizer = EvmddVisualizer(manager)
     visualizer.visualize(evmdd)
 
@@ -32,4 +32,7 @@ setup(
     keywords='evmdd',
     packages=['evmdd'],
     install_requires=[],
+    extras_require={
+        'numpy': ['numpy'],
+    },
 )